@@ -1,32 +1,25 @@
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...schemas.agent import (
     ChatRequest, ChatResponse, ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.registry import get_crew_async
 from models import Club
-from database import get_session
+from database import get_async_db
 import logging
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
-
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
 
 @router.post("/club",response_model=ChatResponse)
-async def chat_with_club(request: ChatRequest ,  db: Session = Depends(get_session)):
+async def chat_with_club(request: ChatRequest ,  db: AsyncSession = Depends(get_async_db)):
    
-        club = db.query(Club).filter(Club.id == request.club_id).first()
-        db.close()
+        club = await db.get(Club, request.club_id)
+        await db.close()
         
         if not club:
             raise HTTPException(
@@ -34,10 +27,10 @@ async def chat_with_club(request: ChatRequest ,  db: Session = Depends(get_sessi
                 detail=f"Club with ID {request.club_id} not found"
             )
 
-        crew = get_crew()
+        crew = await get_crew_async()
         logger.info(f"Processing chat request for club {club.name} (ID: {request.club_id})")
         
-        response = crew.handle_club_query(
+        response = await crew.handle_club_query_async(
             club_id=str(request.club_id),
             student_question=request.question,
             club_personality=request.club_personality or club.personality_style or "friendly"
@@ -49,9 +42,31 @@ async def chat_with_club(request: ChatRequest ,  db: Session = Depends(get_sessi
             response=str(response),
             club_name=club.name
         )
-        
- 
 
 
+@router.post("/club/stream")
+async def stream_chat_with_club(request: ChatRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)):
+    """/chat/club as Server-Sent Events: ``token`` and ``step`` events while the agent works, then ``done``"""
+    club = await db.get(Club, request.club_id)
+    await db.close()
+
+    if not club:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Club with ID {request.club_id} not found"
+        )
+
+    crew = await get_crew_async()
+    logger.info(f"Streaming chat request for club {club.name} (ID: {request.club_id})")
 
+    stream = crew.stream_club_query(
+        club_id=str(request.club_id),
+        student_question=request.question,
+        club_personality=request.club_personality or club.personality_style or "friendly"
+    )
 
+    return StreamingResponse(
+        stream.sse(http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,37 +1,30 @@
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi.responses import StreamingResponse
 from ...schemas.agent import (
     QueryRequest, QueryResponse,
     OnboardingRequest, OnboardingResponse,
     ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.registry import get_crew_async
 from models import Student
-from database import get_session
+from database import get_async_db
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
-
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
 
 @router.post("/query",response_model=QueryResponse )
 async def process_query(request: QueryRequest):
 
    
-        crew = get_crew()
+        crew = await get_crew_async()
         logger.info(f"Processing general query: '{request.query[:50]}...'")
         
-        response = crew.process_student_query(
+        response = await crew.process_student_query_async(
             student_query=request.query,
             context=request.context
         )
@@ -45,10 +38,28 @@ async def process_query(request: QueryRequest):
 
 
 
+@router.post("/query/stream")
+async def stream_query(request: QueryRequest, http_request: Request):
+    """/agents/query as Server-Sent Events: ``token`` and ``step`` events while the agent works, then ``done``"""
+    crew = await get_crew_async()
+    logger.info(f"Streaming general query: '{request.query[:50]}...'")
+
+    stream = crew.stream_student_query(
+        student_query=request.query,
+        context=request.context
+    )
+
+    return StreamingResponse(
+        stream.sse(http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/onboarding",response_model=OnboardingResponse)
-async def onboard_student(request: OnboardingRequest , db: Session = Depends(get_session)):
-    student = db.query(Student).filter(Student.id == request.student_id).first()
-    db.close()
+async def onboard_student(request: OnboardingRequest , db: AsyncSession = Depends(get_async_db)):
+    student = await db.get(Student, request.student_id)
+    await db.close()
 
     if not student:
         raise HTTPException(
@@ -56,10 +67,10 @@ async def onboard_student(request: OnboardingRequest , db: Session = Depends(get
             detail=f"Student with ID {request.student_id} not found"
         )
 
-    crew = get_crew()
+    crew = await get_crew_async()
     logger.info(f"Onboarding student {student.name} (ID: {request.student_id})")
 
-    response = crew.handle_onboarding(str(request.student_id))
+    response = await crew.handle_onboarding_async(str(request.student_id))
 
     logger.info(f"Successfully onboarded student {student.name}")
 
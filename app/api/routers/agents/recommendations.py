@@ -1,13 +1,14 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import Student
 from ...schemas.agent import (
     RecommendationRequest, RecommendationResponse,
     WeeklyDigestRequest, WeeklyDigestResponse,
     ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.registry import get_crew_async
 from ..autontification.token import get_current_user 
 import logging
 import json
@@ -19,22 +20,17 @@ router = APIRouter(
 
 logger = logging.getLogger(__name__)
 
-crew_instance = None
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
 
 @router.post("/", response_model=RecommendationResponse)
 async def get_recommendations(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_db),
    current_user=Depends(get_current_user)
 ):
   
-    student_email = current_user.get("email")
-    student = db.query(Student).filter(Student.email == student_email).first()
+    student_email = current_user.email
+    result = await db.execute(select(Student).where(Student.email == student_email))
+    student = result.scalars().first()
+    await db.close()
 
     if not student:
         raise HTTPException(
@@ -42,10 +38,10 @@ async def get_recommendations(
             detail=f"Student with email {student_email} not found"
         )
 
-    crew = get_crew()
+    crew = await get_crew_async()
     logger.info(f"Generating recommendations for student {student.name} (ID: {student.id})")
 
-    recommendations = crew.handle_recommendation_request(str(student.id))
+    recommendations = await crew.handle_recommendation_request_async(str(student.id))
 
     logger.info(f"Successfully generated recommendations for student {student.name}")
 
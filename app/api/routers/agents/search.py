@@ -3,7 +3,7 @@ from fastapi import APIRouter
 from ...schemas.agent import (
     SearchRequest, SearchResponse, ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.registry import get_crew_async
 import logging
 import json
 
@@ -11,14 +11,6 @@ router = APIRouter(prefix="/search", tags=["Search"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
-
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
 
 @router.post(
     "/",
@@ -27,10 +19,10 @@ def get_crew():
 )
 async def search_events(request: SearchRequest):
  
-        crew = get_crew()
+        crew = await get_crew_async()
         logger.info(f"Processing search query: '{request.query}'")
         
-        results = crew.handle_search_query(
+        results = await crew.handle_search_query_async(
             search_query=request.query,
             filters=request.filters
         )
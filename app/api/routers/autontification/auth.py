@@ -1,35 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db
 from models import Student, Club
 from api.schemas.auth import *
 from .haching import Hash
 from .token import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta, datetime
+import cache
+from pagination import Page, keyset, page_of, page_params, set_next_cursor
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
-def get_db():
-    db = get_session()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/student/register", status_code=status.HTTP_201_CREATED, response_model=RegisterResponse)
-def register_student(student: StudentRegister, db: Session = Depends(get_db)):
-    existing_student = db.query(Student).filter(Student.email == student.email).first()
+async def register_student(student: StudentRegister, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Student).where(Student.email == student.email))
+    existing_student = result.scalars().first()
     if existing_student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = Hash.hash_password(student.password)
+    hashed_password = await run_in_threadpool(Hash.hash_password, student.password)
     
     new_student = Student(
         name=student.name,
@@ -40,8 +38,9 @@ def register_student(student: StudentRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_student)
-    db.commit()
-    db.refresh(new_student)
+    await db.commit()
+    cache.invalidate(("students",))
+    await db.refresh(new_student)
     
     return RegisterResponse(
         success=True,
@@ -51,15 +50,16 @@ def register_student(student: StudentRegister, db: Session = Depends(get_db)):
     )
 
 @router.post("/club/register", status_code=status.HTTP_201_CREATED, response_model=RegisterResponse)
-def register_club(club: ClubRegister, db: Session = Depends(get_db)):
-    existing_club = db.query(Club).filter(Club.email == club.email).first()
+async def register_club(club: ClubRegister, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Club).where(Club.email == club.email))
+    existing_club = result.scalars().first()
     if existing_club:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = Hash.hash_password(club.password)
+    hashed_password = await run_in_threadpool(Hash.hash_password, club.password)
     
     new_club = Club(
         name=club.name,
@@ -73,8 +73,9 @@ def register_club(club: ClubRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_club)
-    db.commit()
-    db.refresh(new_club)
+    await db.commit()
+    cache.invalidate(("clubs",))
+    await db.refresh(new_club)
     
     return RegisterResponse(
         success=True,
@@ -84,9 +85,10 @@ def register_club(club: ClubRegister, db: Session = Depends(get_db)):
     )
 
 @router.post("/student/login", status_code=status.HTTP_200_OK, response_model=Token)
-def login_student(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_student = db.query(Student).filter(Student.email == user.username).first()
-    if not db_student or not Hash.verify_password(user.password, db_student.password_hash):
+async def login_student(user: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Student).where(Student.email == user.username))
+    db_student = result.scalars().first()
+    if not db_student or not await run_in_threadpool(Hash.verify_password, user.password, db_student.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -101,9 +103,10 @@ def login_student(user: OAuth2PasswordRequestForm = Depends(), db: Session = Dep
     return Token(access_token=access_token, token_type="bearer")
 
 @router.post("/club/login", status_code=status.HTTP_200_OK, response_model=Token)
-def login_club(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_club = db.query(Club).filter(Club.email == user.username).first()
-    if not db_club or not Hash.verify_password(user.password, db_club.password_hash):
+async def login_club(user: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Club).where(Club.email == user.username))
+    db_club = result.scalars().first()
+    if not db_club or not await run_in_threadpool(Hash.verify_password, user.password, db_club.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -118,11 +121,23 @@ def login_club(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     return Token(access_token=access_token, token_type="bearer")
 
 @router.get("/students", status_code=status.HTTP_200_OK)
-def get_students(db: Session = Depends(get_db)):
-    students = db.query(Student).all()
+async def get_students(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    result = await db.execute(keyset(select(Student), Student.id, page.after, page.limit))
+    students, next_cursor = page_of(result.scalars().all(), page.limit)
+    set_next_cursor(response, next_cursor)
     return [{"id": s.id, "name": s.name, "email": s.email, "field_of_study": s.field_of_study} for s in students]
 
 @router.get("/clubs", status_code=status.HTTP_200_OK)
-def get_clubs(db: Session = Depends(get_db)):
-    clubs = db.query(Club).all()
+async def get_clubs(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    result = await db.execute(keyset(select(Club), Club.id, page.after, page.limit))
+    clubs, next_cursor = page_of(result.scalars().all(), page.limit)
+    set_next_cursor(response, next_cursor)
     return [{"id": c.id, "name": c.name, "email": c.email, "description": c.description} for c in clubs]
\ No newline at end of file
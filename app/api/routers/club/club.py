@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from database import get_session
+import cache
+from database import get_async_db, get_async_read_db
 from models import Club
 from api.schemas.club import *
 from ..autontification.haching import Hash
@@ -13,22 +16,13 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = get_session()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-
-
 @router.get("/", response_model=ClubResponse, status_code=status.HTTP_200_OK)
 async def get_club(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    result = await db.execute(select(Club).where(Club.email == current_user.email))
+    club = result.scalars().first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
     return club
@@ -37,38 +31,43 @@ async def get_club(
 @router.put("/", response_model=ClubResponse, status_code=status.HTTP_200_OK)
 async def update_club(
     club_update: ClubUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    result = await db.execute(select(Club).where(Club.email == current_user.email))
+    club = result.scalars().first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
     update_data = club_update.dict(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["password_hash"] = Hash.hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await run_in_threadpool(Hash.hash_password, update_data.pop("password"))
 
     for field, value in update_data.items():
         setattr(club, field, value)
 
     club.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(club)
+    await db.commit()
+    cache.invalidate(("club", club.id), ("clubs",))
+    await db.refresh(club)
     return club
 
 
 @router.delete("/", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_club(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    result = await db.execute(select(Club).where(Club.email == current_user.email))
+    club = result.scalars().first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    db.delete(club)
-    db.commit()
+    club_id = club.id
+    await db.delete(club)
+    await db.commit()
+    cache.invalidate(("club", club_id), ("clubs",), ("events",))
 
     return DeleteResponse(
         success=True,
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db
 from models import Event, Club
 from api.schemas.events import *
 from datetime import datetime
+import cache
+from pagination import Page, keyset, page_of, page_params, set_next_cursor
+from workers import view_counter
 from ..autontification.token import get_current_user  
 
 router = APIRouter(
@@ -12,22 +16,15 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = get_session()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=EventResponse)
-def create_event(
+async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     # Récupération du club depuis l'email du token
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    result = await db.execute(select(Club).where(Club.email == current_user.email))
+    club = result.scalars().first()
     if not club:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -47,56 +44,20 @@ def create_event(
     )
 
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.commit()
+    cache.invalidate(("club", club.id), ("events",))
+    await db.refresh(new_event)
     return new_event
 
-@router.get("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
-def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    event.view_count += 1
-    db.commit()
-    return event
-
-
-
-@router.put("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
-def update_event(event_id: int, event_update: EventUpdate, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    update_data = event_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(event, field, value)
-
-    event.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(event)
-    return event
-
-
-@router.delete("/{event_id}", status_code=status.HTTP_200_OK, response_model=DeleteResponse)
-def delete_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    db.delete(event)
-    db.commit()
-    return DeleteResponse(
-        success=True,
-        message="Event deleted successfully",
-        timestamp=datetime.utcnow()
-    )
-
-
 @router.get("/", status_code=status.HTTP_200_OK)
-def get_all_events(db: Session = Depends(get_db)):
-    events = db.query(Event).all()
+async def get_all_events(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    result = await db.execute(keyset(select(Event), Event.id, page.after, page.limit))
+    events, next_cursor = page_of(result.scalars().all(), page.limit)
+    set_next_cursor(response, next_cursor)
     return [{
         "id": e.id,
         "title": e.title,
@@ -108,19 +69,25 @@ def get_all_events(db: Session = Depends(get_db)):
     } for e in events]
 
 
+# Declared before /{event_id} so "club" isn't parsed as an event id
 @router.get("/club", status_code=status.HTTP_200_OK)
-def get_my_events(
-    db: Session = Depends(get_db),
+async def get_my_events(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    result = await db.execute(select(Club).where(Club.email == current_user.email))
+    club = result.scalars().first()
     if not club:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Club not found"
         )
 
-    events = db.query(Event).filter(Event.club_id == club.id).all()
+    result = await db.execute(keyset(select(Event).where(Event.club_id == club.id), Event.id, page.after, page.limit))
+    events, next_cursor = page_of(result.scalars().all(), page.limit)
+    set_next_cursor(response, next_cursor)
     return [{
         "id": e.id,
         "title": e.title,
@@ -129,3 +96,49 @@ def get_my_events(
         "location": e.location,
         "current_registrations": e.current_registrations
     } for e in events]
+
+
+@router.get("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    # Counted in memory and flushed in batches; view_count catches up after the next flush
+    view_counter.record_view(event.id)
+    return event
+
+
+
+@router.put("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
+async def update_event(event_id: int, event_update: EventUpdate, db: AsyncSession = Depends(get_async_db)):
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    update_data = event_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(event, field, value)
+
+    event.updated_at = datetime.utcnow()
+    await db.commit()
+    cache.invalidate(("club", event.club_id), ("events",))
+    await db.refresh(event)
+    return event
+
+
+@router.delete("/{event_id}", status_code=status.HTTP_200_OK, response_model=DeleteResponse)
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    club_id = event.club_id
+    await db.delete(event)
+    await db.commit()
+    cache.invalidate(("club", club_id), ("events",))
+    return DeleteResponse(
+        success=True,
+        message="Event deleted successfully",
+        timestamp=datetime.utcnow()
+    )
@@ -0,0 +1,161 @@
+"""
+Streaming exports of events, registrations and club members.
+
+Rows are read through a server-side cursor (``yield_per``) on a read session
+and written out one batch at a time as NDJSON or CSV, so memory stays flat
+however many rows the export holds.
+
+Clubs export their own data with their bearer token. Analytics jobs send
+``X-Export-Key: $EXPORT_API_KEY`` to export everything (optionally narrowed
+with ``club_id``); key access is off while EXPORT_API_KEY is unset.
+"""
+import io
+import os
+import csv
+import json
+import hmac
+from datetime import date, datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_read_db, get_async_read_session
+from models import Club, Event, Student, event_registrations, club_members
+from ..autontification.token import get_current_user
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["Exports"]
+)
+
+BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Token is optional here because the export key is an alternative
+_optional_token = OAuth2PasswordBearer(tokenUrl="/auth/club/login", auto_error=False)
+
+
+async def export_scope(
+    club_id: Optional[int] = Query(None, description="Only this club's rows (export key only)"),
+    x_export_key: Optional[str] = Header(None),
+    token: Optional[str] = Depends(_optional_token),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Optional[int]:
+    """Club id the export is limited to, or None for everything"""
+    api_key = os.getenv("EXPORT_API_KEY")
+    if x_export_key is not None:
+        if not api_key or not hmac.compare_digest(x_export_key, api_key):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid export key")
+        return club_id
+
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    current_user = await get_current_user(token)
+    result = await db.execute(select(Club.id).where(Club.email == current_user.email))
+    own_club_id = result.scalar()
+    if own_club_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only clubs can export data")
+    if club_id is not None and club_id != own_club_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Clubs can only export their own data")
+    return own_club_id
+
+
+def _value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(columns: list, rows) -> str:
+    return "".join(
+        json.dumps({column: _value(value) for column, value in zip(columns, row)}) + "\n"
+        for row in rows
+    )
+
+
+def _encode_csv(columns: list, rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _csv_header(columns: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+
+async def _rows(stmt, columns: list, fmt: str):
+    # Own session: the request's dependency session may be closed before the body is sent
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if fmt == "csv":
+        yield _csv_header(columns)
+    async with await get_async_read_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=BATCH_SIZE))
+        async for batch in result.partitions():
+            yield encode(columns, batch)
+
+
+def _export(name: str, stmt, fmt: str) -> StreamingResponse:
+    columns = list(stmt.selected_columns.keys())
+    return StreamingResponse(
+        _rows(stmt, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}-{datetime.utcnow():%Y%m%d%H%M%S}.{fmt}"'},
+    )
+
+
+@router.get("/events", status_code=status.HTTP_200_OK)
+async def export_events(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    scope: Optional[int] = Depends(export_scope)
+):
+    stmt = select(
+        Event.id, Event.club_id, Event.title, Event.event_type, Event.location, Event.date,
+        Event.deadline, Event.max_seats, Event.current_registrations, Event.view_count, Event.created_at
+    ).order_by(Event.id)
+    if scope is not None:
+        stmt = stmt.where(Event.club_id == scope)
+    return _export("events", stmt, format)
+
+
+@router.get("/registrations", status_code=status.HTTP_200_OK)
+async def export_registrations(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    scope: Optional[int] = Depends(export_scope)
+):
+    stmt = select(
+        event_registrations.c.event_id, Event.club_id, event_registrations.c.student_id,
+        Student.name.label("student_name"), Student.email.label("student_email"),
+        event_registrations.c.registered_at
+    ).join(Event, Event.id == event_registrations.c.event_id).join(
+        Student, Student.id == event_registrations.c.student_id
+    ).order_by(event_registrations.c.event_id, event_registrations.c.student_id)
+    if scope is not None:
+        stmt = stmt.where(Event.club_id == scope)
+    return _export("registrations", stmt, format)
+
+
+@router.get("/members", status_code=status.HTTP_200_OK)
+async def export_members(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    scope: Optional[int] = Depends(export_scope)
+):
+    stmt = select(
+        club_members.c.club_id, club_members.c.student_id,
+        Student.name.label("student_name"), Student.email.label("student_email"),
+        club_members.c.role, club_members.c.joined_at
+    ).join(Student, Student.id == club_members.c.student_id).order_by(
+        club_members.c.club_id, club_members.c.student_id
+    )
+    if scope is not None:
+        stmt = stmt.where(club_members.c.club_id == scope)
+    return _export("members", stmt, format)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, status
+from database import get_pool_status
+import cache
+from workers import view_counter
+from multi_agents import executor, jobs, registry
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+
+@router.get("/db/pool", status_code=status.HTTP_200_OK)
+def db_pool_status():
+    return get_pool_status()
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+def cache_status():
+    return cache.stats()
+
+
+@router.get("/views", status_code=status.HTTP_200_OK)
+def view_counter_status():
+    return view_counter.get_counter().stats()
+
+
+@router.get("/crew", status_code=status.HTTP_200_OK)
+def crew_status():
+    return {"executor": executor.stats(), "registry": registry.stats(), "jobs": jobs.get_store().stats()}
@@ -0,0 +1,83 @@
+import json
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_read_db
+from models import Student
+from multi_agents.jobs import get_store
+from ...schemas.agent import JobRequest, JobResponse
+import logging
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+logger = logging.getLogger(__name__)
+
+# Seconds between SSE comments that keep proxies from closing an idle stream
+KEEPALIVE_SECONDS = 15
+
+
+def _get_job(job_id: str):
+    job = get_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found or expired")
+    return job
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(request: JobRequest, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    student = await db.get(Student, request.student_id)
+    await db.close()
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Student with ID {request.student_id} not found"
+        )
+
+    job, created = get_store().submit(request.task, request.student_id)
+    if created:
+        logger.info(f"Queued {request.task} job {job.id} for student {request.student_id}")
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return JobResponse(**job.to_dict(), deduplicated=not created)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    return JobResponse(**_get_job(job_id).to_dict())
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events: a ``status`` event now, on every change, and with the result when done"""
+    job = _get_job(job_id)
+
+    def event(data: dict) -> str:
+        return f"event: status\ndata: {json.dumps(data)}\n\n"
+
+    async def stream():
+        sent = job.to_dict()
+        yield event(sent)
+        finished = asyncio.wrap_future(job.future)
+        idle = 0.0
+        while not job.done:
+            if await request.is_disconnected():
+                return
+            # Wake every second to report queued -> running; the future marks completion
+            await asyncio.wait({finished}, timeout=1)
+            current = job.to_dict()
+            if current["status"] != sent["status"]:
+                sent = current
+                yield event(sent)
+                idle = 0.0
+            else:
+                idle += 1
+                if idle >= KEEPALIVE_SECONDS:
+                    yield ": keepalive\n\n"
+                    idle = 0.0
+        if job.to_dict() != sent:
+            yield event(job.to_dict())
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,26 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db
 from models import Skill
 from api.schemas.skill import *
 from datetime import datetime
+import cache
+from pagination import Page, keyset, page_of, page_params, set_next_cursor
 
 router = APIRouter(
     prefix="/skills",
     tags=["Skills"]
 )
 
-def get_db():
-    db = get_session()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=SkillResponse)
-def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
-    existing_skill = db.query(Skill).filter(Skill.name == skill.name).first()
+async def create_skill(skill: SkillCreate, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Skill).where(Skill.name == skill.name))
+    existing_skill = result.scalars().first()
     if existing_skill:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,15 +29,16 @@ def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_skill)
-    db.commit()
-    db.refresh(new_skill)
+    await db.commit()
+    cache.invalidate(("skills",))
+    await db.refresh(new_skill)
     
     return new_skill
 
 
 @router.get("/{skill_id}", status_code=status.HTTP_200_OK, response_model=SkillResponse)
-def get_skill(skill_id: int, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def get_skill(skill_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    skill = await db.get(Skill, skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,8 +48,8 @@ def get_skill(skill_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{skill_id}", status_code=status.HTTP_200_OK, response_model=SkillResponse)
-def update_skill(skill_id: int, skill_update: SkillUpdate, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def update_skill(skill_id: int, skill_update: SkillUpdate, db: AsyncSession = Depends(get_async_db)):
+    skill = await db.get(Skill, skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,23 +61,25 @@ def update_skill(skill_id: int, skill_update: SkillUpdate, db: Session = Depends
     for field, value in update_data.items():
         setattr(skill, field, value)
     
-    db.commit()
-    db.refresh(skill)
+    await db.commit()
+    cache.invalidate(("skills",))
+    await db.refresh(skill)
     
     return skill
 
 
 @router.delete("/{skill_id}", status_code=status.HTTP_200_OK, response_model=DeleteResponse)
-def delete_skill(skill_id: int, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def delete_skill(skill_id: int, db: AsyncSession = Depends(get_async_db)):
+    skill = await db.get(Skill, skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Skill not found"
         )
     
-    db.delete(skill)
-    db.commit()
+    await db.delete(skill)
+    await db.commit()
+    cache.invalidate(("skills",))
     
     return DeleteResponse(
         success=True,
@@ -90,8 +89,14 @@ def delete_skill(skill_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-def get_all_skills(db: Session = Depends(get_db)):
-    skills = db.query(Skill).all()
+async def get_all_skills(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    result = await db.execute(keyset(select(Skill), Skill.id, page.after, page.limit))
+    skills, next_cursor = page_of(result.scalars().all(), page.limit)
+    set_next_cursor(response, next_cursor)
     return [{
         "id": s.id,
         "name": s.name,
@@ -100,8 +105,9 @@ def get_all_skills(db: Session = Depends(get_db)):
 
 
 @router.get("/category/{category}", status_code=status.HTTP_200_OK)
-def get_skills_by_category(category: str, db: Session = Depends(get_db)):
-    skills = db.query(Skill).filter(Skill.category == category).all()
+async def get_skills_by_category(category: str, db: AsyncSession = Depends(get_async_read_db)):
+    result = await db.execute(select(Skill).where(Skill.category == category))
+    skills = result.scalars().all()
     return [{
         "id": s.id,
         "name": s.name,
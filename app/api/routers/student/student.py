@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from database import get_session
+import cache
+from database import get_async_db, get_async_read_db
 from models import Student, StudentProfile
 from api.schemas.student import *
 from ..autontification.haching import Hash
@@ -13,25 +16,13 @@ router = APIRouter(
 )
 
 
-
-
-
-def get_db():
-    db = get_session()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-
-
 @router.get("/", response_model=StudentResponse, status_code=status.HTTP_200_OK)
 async def get_student(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
@@ -40,38 +31,43 @@ async def get_student(
 @router.put("/", response_model=StudentResponse, status_code=status.HTTP_200_OK)
 async def update_student(
     student_update: StudentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
     update_data = student_update.dict(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["password_hash"] = Hash.hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await run_in_threadpool(Hash.hash_password, update_data.pop("password"))
 
     for field, value in update_data.items():
         setattr(student, field, value)
 
     student.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(student)
+    await db.commit()
+    cache.invalidate(("student", student.id), ("students",))
+    await db.refresh(student)
     return student
 
 
 @router.delete("/", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_student(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    db.delete(student)
-    db.commit()
+    student_id = student.id
+    await db.delete(student)
+    await db.commit()
+    cache.invalidate(("student", student_id), ("students",), ("clubs",))
 
     return DeleteResponse(
         success=True,
@@ -84,16 +80,18 @@ async def delete_student(
 @router.post("/profile", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile: ProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    existing_profile = db.query(StudentProfile).filter(
+    result = await db.execute(select(StudentProfile).where(
         StudentProfile.student_id == student.id
-    ).first()
+    ))
+    existing_profile = result.scalars().first()
     if existing_profile:
         raise HTTPException(status_code=400, detail="Profile already exists")
 
@@ -105,23 +103,26 @@ async def create_profile(
     )
 
     db.add(new_profile)
-    db.commit()
-    db.refresh(new_profile)
+    await db.commit()
+    cache.invalidate(("student", student.id))
+    await db.refresh(new_profile)
     return new_profile
 
 
 @router.get("/profile", response_model=ProfileResponse, status_code=status.HTTP_200_OK)
 async def get_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
+    result = await db.execute(select(StudentProfile).where(
         StudentProfile.student_id == student.id
-    ).first()
+    ))
+    profile = result.scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -131,16 +132,18 @@ async def get_profile(
 @router.put("/profile", response_model=ProfileResponse, status_code=status.HTTP_200_OK)
 async def update_profile(
     profile_update: ProfileUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
+    result = await db.execute(select(StudentProfile).where(
         StudentProfile.student_id == student.id
-    ).first()
+    ))
+    profile = result.scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -149,28 +152,32 @@ async def update_profile(
         setattr(profile, field, value)
 
     profile.last_updated = datetime.utcnow()
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    cache.invalidate(("student", student.id))
+    await db.refresh(profile)
     return profile
 
 
 @router.delete("/profile", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    result = await db.execute(select(Student).where(Student.email == current_user.email))
+    student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
+    result = await db.execute(select(StudentProfile).where(
         StudentProfile.student_id == student.id
-    ).first()
+    ))
+    profile = result.scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    db.delete(profile)
-    db.commit()
+    await db.delete(profile)
+    await db.commit()
+    cache.invalidate(("student", student.id))
 
     return DeleteResponse(
         success=True,
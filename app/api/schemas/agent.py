@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 
 
@@ -192,4 +192,30 @@ class SearchResponse(BaseModel):
                 "query": "AI workshop",
                 "count": 3
             }
-        }
\ No newline at end of file
+        }
+
+
+class JobRequest(BaseModel):
+    task: Literal["weekly_digest", "onboarding", "recommendations"] = Field(..., description="Crew task to run")
+    student_id: int = Field(..., description="Student ID")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "task": "weekly_digest",
+                "student_id": 1
+            }
+        }
+
+
+class JobResponse(BaseModel):
+    job_id: str = Field(..., description="Job ID")
+    task: str = Field(..., description="Crew task")
+    student_id: int = Field(..., description="Student ID")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    result: Optional[str] = Field(None, description="Crew output once the job succeeded")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: float = Field(..., description="Unix time the job was submitted")
+    started_at: Optional[float] = Field(None, description="Unix time the crew started")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished")
+    deduplicated: bool = Field(False, description="True when an identical running job was returned")
@@ -0,0 +1,226 @@
+"""
+Scale benchmark for DatabaseTool operations.
+
+Seeds each database at each size tier, runs every operation against it and
+reports latency percentiles, statements per call and peak Python memory.
+Results are written as JSON keyed by commit so runs can be compared.
+
+    python -m benchmarks.bench_tool run \\
+        --database-url sqlite:////tmp/bench.db \\
+        --database-url postgresql://localhost/bench \\
+        --tier 10k --tier 100k
+    python -m benchmarks.bench_tool compare results/old.json results/new.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine, select
+import database
+import sqlprofile
+from models import Student, Club, Event
+from .seed import TIERS, TOPICS, EVENT_TYPES, generate, row_counts
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+OPERATIONS = [
+    "get_student", "get_club", "get_events", "search_events", "get_recommendations",
+    "get_trending_events", "get_club_members", "get_similar_students", "get_all_students",
+    "get_all_clubs", "get_all_skills", "update_profile", "register_event",
+]
+
+
+def _random_params(rng: random.Random, ids: dict) -> dict:
+    """Parameter factories for every DatabaseTool operation"""
+    student = lambda: rng.choice(ids["students"])
+    club = lambda: rng.choice(ids["clubs"])
+    event = lambda: rng.choice(ids["events"])
+    now = datetime.utcnow()
+    return {
+        "get_student": lambda: {"student_id": student()},
+        "get_club": lambda: {"club_id": club()},
+        "get_events": lambda: {
+            "date_from": now.isoformat(),
+            "date_to": (now + timedelta(days=30)).isoformat(),
+            "event_type": rng.choice(EVENT_TYPES),
+        },
+        "search_events": lambda: {"query": f"{rng.choice(TOPICS)} {rng.choice(EVENT_TYPES)}"},
+        "get_recommendations": lambda: {"student_id": student()},
+        "get_trending_events": lambda: {},
+        "get_club_members": lambda: {"club_id": club()},
+        "get_similar_students": lambda: {"student_id": student()},
+        "get_all_students": lambda: {},
+        "get_all_clubs": lambda: {},
+        "get_all_skills": lambda: {},
+        "update_profile": lambda: {"student_id": student(), "bio": "benchmark bio"},
+        "register_event": lambda: {"student_id": student(), "event_id": event()},
+    }
+
+
+def _sample_ids(engine, limit: int = 5000) -> dict:
+    with engine.connect() as conn:
+        return {
+            "students": conn.execute(select(Student.id).limit(limit)).scalars().all(),
+            "clubs": conn.execute(select(Club.id).limit(limit)).scalars().all(),
+            "events": conn.execute(select(Event.id).limit(limit)).scalars().all(),
+        }
+
+
+def _percentile(samples: list, pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def bench_operation(tool, operation: str, make_params, iterations: int) -> dict:
+    latencies, queries, errors = [], [], 0
+    for _ in range(iterations):
+        params = make_params()
+        with sqlprofile.profile(operation, log=False) as prof:
+            started = time.perf_counter()
+            result = tool._run(operation, params)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(prof.count)
+        if '"error"' in result[:20]:
+            errors += 1
+
+    # Separate pass so tracemalloc overhead doesn't skew the latencies
+    tracemalloc.start()
+    tool._run(operation, make_params())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p90_ms": round(_percentile(latencies, 90), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries_max": max(queries),
+        "queries_mean": round(statistics.fmean(queries), 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_suite(database_url: str, tier: str, iterations: int, operations: list, seed: bool) -> dict:
+    engine = create_engine(database_url)
+    if seed:
+        print(f"Seeding {engine.dialect.name} at tier {tier}...", file=sys.stderr)
+        counts = generate(engine, tier)
+    else:
+        counts = row_counts(engine)
+    ids = _sample_ids(engine)
+    engine.dispose()
+
+    # Point the application engine at the benchmark database
+    os.environ["DATABASE_URL"] = database_url
+    # Time the database, not result-cache hits on repeated parameters
+    os.environ["CACHE_ENABLED"] = "false"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    database.dispose_engine()
+
+    from multi_agents.tools.databasetool import DatabaseTool
+    tool = DatabaseTool()
+    rng = random.Random(1234)
+    factories = _random_params(rng, ids)
+
+    results = {}
+    for operation in operations:
+        print(f"  {tier} {operation}", file=sys.stderr)
+        results[operation] = bench_operation(tool, operation, factories[operation], iterations)
+    database.dispose_engine()
+
+    return {
+        "database": engine.dialect.name,
+        "tier": tier,
+        "rows": counts,
+        "operations": results,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def cmd_run(args):
+    logging.basicConfig(level=logging.WARNING)
+    operations = args.operation or OPERATIONS
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "results": [
+            run_suite(url, tier, args.iterations, operations, not args.skip_seed)
+            for url in args.database_url
+            for tier in args.tier
+        ],
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+def cmd_compare(args):
+    """Print p50/p99/query deltas between two result files"""
+    old, new = (json.loads(Path(p).read_text()) for p in (args.old, args.new))
+    old_index = {(r["database"], r["tier"]): r["operations"] for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    for suite in new["results"]:
+        before = old_index.get((suite["database"], suite["tier"]), {})
+        print(f"\n[{suite['database']} {suite['tier']}]")
+        for operation, stats in suite["operations"].items():
+            prev = before.get(operation)
+            if prev is None:
+                print(f"  {operation:<22} p50 {stats['p50_ms']:>9.2f}ms (new)")
+                continue
+            print(
+                f"  {operation:<22} p50 {prev['p50_ms']:>9.2f} -> {stats['p50_ms']:>9.2f}ms"
+                f"  p99 {prev['p99_ms']:>9.2f} -> {stats['p99_ms']:>9.2f}ms"
+                f"  queries {prev['queries_max']:>4} -> {stats['queries_max']:<4}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseTool operations at scale")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run")
+    run.add_argument("--database-url", action="append", required=True)
+    run.add_argument("--tier", action="append", choices=sorted(TIERS))
+    run.add_argument("--operation", action="append", choices=OPERATIONS)
+    run.add_argument("--iterations", type=int, default=50)
+    run.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    run.add_argument("--output")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    if getattr(args, "tier", None) is None and args.command == "run":
+        args.tier = ["10k"]
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark the deterministic query-understanding stage against the LLM-only path.
+
+``parse`` times ``search.query_understanding.understand`` on a fixed set of
+student queries and shows what it extracted. ``llm`` runs each query through
+``ClubEventHubCrew.handle_search_query`` twice, once with the stage and once
+without (the previous, LLM-only behaviour). It reports wall time, LLM
+requests and tokens per query. This calls the configured model and costs
+tokens.
+
+    python -m benchmarks.query_understanding parse --database-url sqlite:////tmp/bench.db
+    python -m benchmarks.query_understanding llm --database-url sqlite:////tmp/bench.db --limit 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime
+from pathlib import Path
+import database
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+QUERIES = [
+    "coding hackathons this weekend",
+    "AI workshop next week",
+    "any deep learning talks on friday",
+    "robotics club events",
+    "cybersecurity contest in 10 days",
+    "web development bootcamp next month",
+    "social events tonight",
+    "startup pitch competition",
+    "hands-on ML class tomorrow",
+    "chess and debate meetups this month",
+    "photography workshops by the photography club",
+    "data science lectures this week",
+    "music jam session next weekend",
+    "climate and sustainability seminar",
+    "figma ui design workshop",
+    "cloud devops training in 3 days",
+    "mobile app development hackathon",
+    "finance and investing talk",
+    "public speaking events on monday",
+    "what's happening this weekend",
+]
+
+
+def _point_at(database_url: str):
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    database.dispose_engine()
+
+
+def cmd_parse(args):
+    from search.query_understanding import understand
+
+    _point_at(args.database_url)
+    session = database.get_session(read_only=True)
+    try:
+        understand(QUERIES[0], session)  # build the trigram indexes outside the timing
+        timings, rows = [], []
+        for query in QUERIES:
+            samples = []
+            for _ in range(args.iterations):
+                started = time.perf_counter()
+                parsed = understand(query, session)
+                samples.append((time.perf_counter() - started) * 1e6)
+            timings.extend(samples)
+            rows.append({"query": query, "median_us": round(statistics.median(samples), 1), **parsed})
+    finally:
+        session.close()
+        database.dispose_engine()
+
+    for row in rows:
+        print(f"{row['median_us']:>8.1f}us  {row['query']!r}")
+        print(f"            terms={row['terms']} filters={row['filters']} event_types={row['event_types']} skills={row['skills']}")
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    print(f"\nunderstand(): p50 {quantiles[49]:.1f}us  p99 {quantiles[98]:.1f}us, no LLM tokens")
+
+
+def _usage(result) -> dict:
+    usage = getattr(result, "token_usage", None)
+    return {
+        "total_tokens": getattr(usage, "total_tokens", None),
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "requests": getattr(usage, "successful_requests", None),
+    }
+
+
+def cmd_llm(args):
+    from multi_agents.registry import get_crew
+
+    _point_at(args.database_url)
+    crew = get_crew()
+    runs = []
+    for query in QUERIES[:args.limit]:
+        for understand in (False, True):
+            started = time.perf_counter()
+            result = crew.handle_search_query(query, understand=understand)
+            elapsed = time.perf_counter() - started
+            runs.append({
+                "query": query,
+                "path": "understood" if understand else "llm_only",
+                "seconds": round(elapsed, 3),
+                **_usage(result),
+            })
+            print(f"  {runs[-1]['path']:<10} {elapsed:>7.2f}s  {runs[-1]['total_tokens']} tokens  {query!r}",
+                  file=sys.stderr)
+    database.dispose_engine()
+
+    summary = {}
+    for path in ("llm_only", "understood"):
+        subset = [run for run in runs if run["path"] == path]
+        tokens = [run["total_tokens"] for run in subset if run["total_tokens"] is not None]
+        summary[path] = {
+            "median_seconds": round(statistics.median(run["seconds"] for run in subset), 3),
+            "median_tokens": statistics.median(tokens) if tokens else None,
+        }
+    print(json.dumps(summary, indent=2))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"query_understanding-{datetime.utcnow():%Y%m%d%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"summary": summary, "runs": runs}, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query understanding against the LLM-only path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    parse = sub.add_parser("parse")
+    parse.add_argument("--database-url", required=True)
+    parse.add_argument("--iterations", type=int, default=200)
+    parse.set_defaults(func=cmd_parse)
+
+    llm = sub.add_parser("llm")
+    llm.add_argument("--database-url", required=True)
+    llm.add_argument("--limit", type=int, default=len(QUERIES), help="queries to send")
+    llm.add_argument("--output")
+    llm.set_defaults(func=cmd_llm)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Parity check for the SQL recommendation scorer.
+
+Runs DatabaseTool's get_recommendations for a sample of students and compares
+it with the previous Python scorer (kept below as ``legacy_recommendations``):
+same events, same order, same scores and the same reasons. Ties on score are
+ordered by event id on both sides. Exits 1 on any mismatch.
+
+    python -m benchmarks.recommendation_parity --database-url sqlite:////tmp/bench.db --tier 10k
+    python -m benchmarks.recommendation_parity --database-url postgresql://localhost/bench --skip-seed
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import datetime
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload, joinedload
+import database
+from models import Student, Event, event_registrations
+from .seed import TIERS, generate
+
+
+def legacy_recommendations(session: Session, student_id: int, limit: int = 15) -> list:
+    """The Python scorer get_recommendations used before scoring moved into SQL"""
+    student = session.query(Student).options(
+        selectinload(Student.skills), selectinload(Student.clubs)
+    ).filter(Student.id == student_id).first()
+    student_skill_ids = [s.id for s in student.skills]
+    student_club_ids = {c.id for c in student.clubs}
+    registered_event_ids = set(session.execute(
+        select(event_registrations.c.event_id).where(event_registrations.c.student_id == student_id)
+    ).scalars())
+
+    upcoming_events = session.query(Event).options(
+        joinedload(Event.club), selectinload(Event.required_skills)
+    ).filter(Event.date > datetime.utcnow()).all()
+
+    recommendations = []
+    for event in upcoming_events:
+        if event.id in registered_event_ids:
+            continue
+        score = 0
+        reasons = []
+        event_skill_ids = [s.id for s in event.required_skills]
+        matching_skills = set(student_skill_ids) & set(event_skill_ids)
+        if matching_skills:
+            skill_names = [s.name for s in event.required_skills if s.id in matching_skills]
+            score += len(matching_skills) * 25
+            reasons.append(f"Matches your skills: {', '.join(skill_names)}")
+        if event.club_id in student_club_ids:
+            score += 30
+            reasons.append("Your club's event")
+        if event.is_trending:
+            score += 15
+            reasons.append("Trending event")
+        score += event.view_count * 0.05
+        if score > 0 or len(reasons) > 0:
+            recommendations.append({
+                "item_id": event.id,
+                "item_type": "event",
+                "title": event.title,
+                "club_name": event.club.name,
+                "date": event.date.isoformat(),
+                "location": event.location,
+                "score": round(score, 2),
+                "reasons": reasons if reasons else ["Popular event"]
+            })
+
+    recommendations.sort(key=lambda x: (-x['score'], x['item_id']))
+    return recommendations[:limit]
+
+
+def _normalize(recommendation: dict) -> dict:
+    """Skill names within a reason are compared as a set"""
+    reasons = []
+    for reason in recommendation["reasons"]:
+        prefix, sep, names = reason.partition(": ")
+        if sep:
+            reason = prefix + sep + ", ".join(sorted(names.split(", ")))
+        reasons.append(reason)
+    return {**recommendation, "reasons": reasons}
+
+
+def compare(expected: list, actual: list) -> list:
+    """Human-readable differences between two recommendation lists"""
+    problems = []
+    if [r["item_id"] for r in expected] != [r["item_id"] for r in actual]:
+        problems.append(
+            f"ranking differs: {[r['item_id'] for r in expected]} != {[r['item_id'] for r in actual]}"
+        )
+        return problems
+    for old, new in zip(map(_normalize, expected), map(_normalize, actual)):
+        for field, value in old.items():
+            if new.get(field) != value:
+                problems.append(f"event {old['item_id']} {field}: {value!r} != {new.get(field)!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQL recommendations with the Python scorer")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--tier", choices=sorted(TIERS), default="10k")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--students", type=int, default=200, help="students to sample")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if not args.skip_seed:
+        print(f"Seeding {engine.dialect.name} at tier {args.tier}...", file=sys.stderr)
+        generate(engine, args.tier)
+    with engine.connect() as conn:
+        student_ids = conn.execute(select(Student.id)).scalars().all()
+    sample = random.Random(args.seed).sample(student_ids, min(args.students, len(student_ids)))
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["CACHE_ENABLED"] = "false"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    database.dispose_engine()
+
+    from multi_agents.tools.databasetool import DatabaseTool
+    tool = DatabaseTool()
+
+    failures = 0
+    with Session(engine) as session:
+        for student_id in sample:
+            expected = legacy_recommendations(session, student_id)
+            actual = json.loads(tool._run("get_recommendations", {"student_id": student_id}))
+            problems = compare(expected, actual)
+            if problems:
+                failures += 1
+                print(f"student {student_id}:", file=sys.stderr)
+                for problem in problems:
+                    print(f"  {problem}", file=sys.stderr)
+    database.dispose_engine()
+    engine.dispose()
+
+    print(f"{len(sample) - failures}/{len(sample)} students match")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
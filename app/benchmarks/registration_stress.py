@@ -0,0 +1,151 @@
+"""
+Concurrency stress test for register_event.
+
+Creates one hot event with a small number of seats, then fires thousands of
+parallel registrations at it through DatabaseTool. Some are repeats of the
+same student. Afterwards it checks that the event is not overbooked, that
+``current_registrations`` equals the number of registration rows, and that
+every success has exactly one row. It reports throughput and latency, and
+exits 1 if any invariant fails.
+
+Needs a seeded database with at least ``--attempts`` students (see
+benchmarks.seed). Meant for Postgres; SQLite serializes writers, so expect
+"database is locked" errors there once the worker count goes up.
+
+    python -m benchmarks.registration_stress --database-url postgresql://localhost/bench \\
+        --seats 100 --attempts 5000 --workers 32
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, select
+import database
+from models import Club, Event, Student, event_registrations
+
+
+def _create_hot_event(engine, seats: int) -> int:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        club_id = conn.execute(select(Club.id).order_by(Club.id).limit(1)).scalar()
+        if club_id is None:
+            raise SystemExit("No clubs found; seed the database first (python -m benchmarks.seed)")
+        return conn.execute(Event.__table__.insert().values(
+            club_id=club_id,
+            title="Registration stress test",
+            description="Hot event for benchmarks.registration_stress",
+            event_type="workshop",
+            location="Stress Hall",
+            date=now + timedelta(days=7),
+            deadline=now + timedelta(days=6),
+            max_seats=seats,
+            current_registrations=0,
+            is_trending=False,
+            view_count=0,
+            created_at=now,
+            updated_at=now,
+        )).inserted_primary_key[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fire parallel registrations at one event")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--seats", type=int, default=100)
+    parser.add_argument("--attempts", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1,
+                        help="share of attempts that repeat an earlier student")
+    parser.add_argument("--keep", action="store_true", help="leave the test event in place")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.connect() as conn:
+        student_ids = conn.execute(select(Student.id).order_by(Student.id).limit(args.attempts)).scalars().all()
+    if not student_ids:
+        raise SystemExit("No students found; seed the database first (python -m benchmarks.seed)")
+    event_id = _create_hot_event(engine, args.seats)
+
+    rng = random.Random(99)
+    attempts = [
+        rng.choice(student_ids) if rng.random() < args.duplicate_ratio else student_ids[i % len(student_ids)]
+        for i in range(args.attempts)
+    ]
+
+    # One pooled connection per worker
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_POOL_SIZE"] = str(args.workers)
+    os.environ["CACHE_ENABLED"] = "false"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    database.dispose_engine()
+
+    from multi_agents.tools.databasetool import DatabaseTool
+    tool = DatabaseTool()
+
+    def register(student_id):
+        started = time.perf_counter()
+        result = json.loads(tool._run("register_event", {"student_id": student_id, "event_id": event_id}))
+        return student_id, result, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        outcomes = list(executor.map(register, attempts))
+    elapsed = time.perf_counter() - started
+    database.dispose_engine()
+
+    results = Counter()
+    succeeded = Counter()
+    for student_id, result, _ in outcomes:
+        if result.get("success"):
+            results["registered"] += 1
+            succeeded[student_id] += 1
+        else:
+            results[result.get("error", "unknown")] += 1
+    latencies = [latency for _, _, latency in outcomes]
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    with engine.connect() as conn:
+        counter = conn.execute(select(Event.current_registrations).where(Event.id == event_id)).scalar()
+        rows = conn.execute(
+            select(func.count()).select_from(event_registrations).where(event_registrations.c.event_id == event_id)
+        ).scalar()
+        registered_ids = set(conn.execute(
+            select(event_registrations.c.student_id).where(event_registrations.c.event_id == event_id)
+        ).scalars())
+        if not args.keep:
+            conn.execute(Event.__table__.delete().where(Event.id == event_id))
+            conn.commit()
+    engine.dispose()
+
+    failures = []
+    if counter > args.seats:
+        failures.append(f"overbooked: {counter} registrations for {args.seats} seats")
+    if counter != rows:
+        failures.append(f"current_registrations={counter} but {rows} registration rows")
+    if results["registered"] != rows:
+        failures.append(f"{results['registered']} successful calls but {rows} registration rows")
+    doubled = [student_id for student_id, count in succeeded.items() if count > 1]
+    if doubled:
+        failures.append(f"{len(doubled)} students registered more than once")
+    if set(succeeded) != registered_ids:
+        failures.append("students reported as registered differ from the registration rows")
+
+    print(f"{args.attempts} attempts, {args.workers} workers, {args.seats} seats in {elapsed:.2f}s")
+    print(f"  throughput {args.attempts / elapsed:.0f} req/s, "
+          f"latency p50 {quantiles[49]:.1f}ms p99 {quantiles[98]:.1f}ms max {max(latencies):.1f}ms")
+    for outcome, count in results.most_common():
+        print(f"  {count:>6}  {outcome}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print("OK: no overbooking, counter matches registrations")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Synthetic dataset generator for DatabaseTool benchmarks.
+
+Fills students, clubs, events, skills and the association tables at a given
+size tier. Skill, club and event popularity follow a Zipf-like distribution,
+so a few skills/clubs/events receive most of the links the way real usage does.
+
+    python -m benchmarks.seed --tier 10k --database-url sqlite:///bench.db
+"""
+import random
+import argparse
+import itertools
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, select, text
+from database import Base
+from migrations import schema_migrations, upgrade
+from search.fulltext import drop_sqlite_index
+from workers.trending import bucket_start, refresh
+from models import (
+    Student, Club, Event, Skill,
+    student_skills, event_skills, event_registrations, club_members, event_activity_buckets
+)
+
+# Number of students per tier; the other tables scale from it
+TIERS = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+SKILL_CATEGORIES = ["technical", "soft_skill", "language", "design", "science", "business"]
+EVENT_TYPES = ["workshop", "hackathon", "social", "competition", "talk", "meetup", "bootcamp"]
+FIELDS_OF_STUDY = [
+    "Computer Science", "Electrical Engineering", "Mathematics", "Physics", "Biology",
+    "Economics", "Design", "Mechanical Engineering", "Chemistry", "Business",
+]
+TOPICS = [
+    "AI", "machine learning", "robotics", "web", "mobile", "security", "data", "cloud",
+    "design", "startup", "finance", "music", "photography", "chess", "debate", "climate",
+]
+PLACEHOLDER_HASH = "$2b$12$benchmarkbenchmarkbenchmarkbenchmarkbenchmarkbench"
+CHUNK_SIZE = 10_000
+
+
+def tier_sizes(tier: str) -> dict:
+    students = TIERS[tier]
+    return {
+        "students": students,
+        "skills": 500,
+        "clubs": max(10, students // 100),
+        "events": max(50, students // 20),
+    }
+
+
+def zipf_weights(n: int, exponent: float = 1.1) -> list:
+    """Cumulative weights where rank r has weight 1 / r**exponent"""
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+def sample_distinct(rng: random.Random, population: range, cum_weights: list, k: int) -> set:
+    """k distinct values drawn with popularity skew"""
+    k = min(k, len(population))
+    picked = set()
+    while len(picked) < k:
+        picked.update(rng.choices(population, cum_weights=cum_weights, k=k - len(picked)))
+    return picked
+
+
+def _insert_chunks(conn, table, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.execute(table.insert(), chunk)
+            chunk = []
+    if chunk:
+        conn.execute(table.insert(), chunk)
+
+
+def _reset_sequences(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("students", "clubs", "events", "skills"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def generate(engine, tier: str, seed: int = 42) -> dict:
+    """Drop and rebuild the schema through the migrations, then fill it for the given tier"""
+    rng = random.Random(seed)
+    sizes = tier_sizes(tier)
+    n_students, n_skills, n_clubs, n_events = (
+        sizes["students"], sizes["skills"], sizes["clubs"], sizes["events"]
+    )
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        drop_sqlite_index(conn)
+    Base.metadata.drop_all(engine)
+    schema_migrations.drop(engine, checkfirst=True)
+    upgrade(engine)
+
+    skill_ids = range(1, n_skills + 1)
+    club_ids = range(1, n_clubs + 1)
+    student_ids = range(1, n_students + 1)
+    skill_weights = zipf_weights(n_skills)
+    club_weights = zipf_weights(n_clubs)
+    event_weights = zipf_weights(n_events, exponent=0.9)
+
+    with engine.begin() as conn:
+        _insert_chunks(conn, Skill.__table__, (
+            {"id": i, "name": f"skill-{i}", "category": SKILL_CATEGORIES[i % len(SKILL_CATEGORIES)]}
+            for i in skill_ids
+        ))
+        _insert_chunks(conn, Club.__table__, (
+            {
+                "id": i,
+                "name": f"{TOPICS[i % len(TOPICS)].title()} Club {i}",
+                "email": f"club{i}@bench.local",
+                "password_hash": PLACEHOLDER_HASH,
+                "description": f"A club about {TOPICS[i % len(TOPICS)]} and friends",
+                "personality_style": "friendly",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in club_ids
+        ))
+        _insert_chunks(conn, Student.__table__, (
+            {
+                "id": i,
+                "name": f"Student {i}",
+                "email": f"student{i}@bench.local",
+                "password_hash": PLACEHOLDER_HASH,
+                "field_of_study": FIELDS_OF_STUDY[i % len(FIELDS_OF_STUDY)],
+                "year_level": 1 + i % 5,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in student_ids
+        ))
+        _insert_chunks(conn, student_skills, (
+            {"student_id": student_id, "skill_id": skill_id}
+            for student_id in student_ids
+            for skill_id in sample_distinct(rng, skill_ids, skill_weights, rng.randint(2, 8))
+        ))
+        _insert_chunks(conn, club_members, (
+            {"student_id": student_id, "club_id": club_id, "joined_at": now, "role": "member"}
+            for student_id in student_ids
+            for club_id in sample_distinct(rng, club_ids, club_weights, rng.choice((0, 1, 1, 2, 3)))
+        ))
+
+        # Registrations: event popularity is skewed, each event gets a Zipf share of the total
+        total_registrations = n_students * 3
+        total_weight = event_weights[-1]
+        registrations = []
+        for rank in range(n_events):
+            weight = event_weights[rank] - (event_weights[rank - 1] if rank else 0)
+            registrations.append(min(n_students, int(total_registrations * weight / total_weight)))
+        event_order = list(range(1, n_events + 1))
+        rng.shuffle(event_order)  # popularity is independent of id order
+
+        def events():
+            for rank, event_id in enumerate(event_order):
+                count = registrations[rank]
+                topic = TOPICS[event_id % len(TOPICS)]
+                event_type = EVENT_TYPES[event_id % len(EVENT_TYPES)]
+                date = now + timedelta(days=rng.uniform(-30, 90))
+                max_seats = None if event_id % 4 == 0 else count + rng.randint(0, 50)
+                yield {
+                    "id": event_id,
+                    "club_id": rng.choices(club_ids, cum_weights=club_weights)[0],
+                    "title": f"{topic.title()} {event_type} #{event_id}",
+                    "description": f"Hands-on {event_type} about {topic} for all levels",
+                    "event_type": event_type,
+                    "location": f"Room {event_id % 200}",
+                    "date": date,
+                    "deadline": date - timedelta(days=2),
+                    "max_seats": max_seats,
+                    "current_registrations": count,
+                    "is_trending": rank < max(1, n_events // 100),
+                    "view_count": int(count * rng.uniform(2, 10)),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+
+        _insert_chunks(conn, Event.__table__, events())
+        _insert_chunks(conn, event_skills, (
+            {"event_id": event_id, "skill_id": skill_id}
+            for event_id in range(1, n_events + 1)
+            for skill_id in sample_distinct(rng, skill_ids, skill_weights, rng.randint(1, 4))
+        ))
+        _insert_chunks(conn, event_registrations, (
+            {"student_id": student_id, "event_id": event_id, "registered_at": now}
+            for rank, event_id in enumerate(event_order)
+            for student_id in rng.sample(student_ids, registrations[rank])
+        ))
+        # Recent activity for a tenth of the events, so trending scores have something to rank
+        def activity():
+            for event_id in rng.sample(range(1, n_events + 1), max(1, n_events // 10)):
+                hours = rng.sample(range(72), rng.randint(1, 24))
+                for start in sorted({bucket_start(now - timedelta(hours=hour)) for hour in hours}):
+                    yield {
+                        "event_id": event_id,
+                        "bucket_start": start,
+                        "views": rng.randint(0, 200),
+                        "registrations": rng.randint(0, 10),
+                    }
+
+        _insert_chunks(conn, event_activity_buckets, activity())
+        _reset_sequences(conn)
+
+    refresh(engine, now)
+    return row_counts(engine)
+
+
+def row_counts(engine) -> dict:
+    tables = {
+        "students": Student.__table__, "clubs": Club.__table__, "events": Event.__table__,
+        "skills": Skill.__table__, "student_skills": student_skills, "event_skills": event_skills,
+        "event_registrations": event_registrations, "club_members": club_members,
+        "event_activity_buckets": event_activity_buckets,
+    }
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(select(func.count()).select_from(table)).scalar()
+            for name, table in tables.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic ClubEvent Hub data")
+    parser.add_argument("--tier", choices=sorted(TIERS), default="10k")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    counts = generate(engine, args.tier, args.seed)
+    for table, count in counts.items():
+        print(f"{table:>20}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start benchmark: how long importing the app takes, and where the time goes.
+
+Each run imports the target (``main`` by default) in a fresh interpreter with
+``python -X importtime``. It reports the median wall time over the runs, the
+modules with the largest cumulative import cost, and whether crewai was
+imported (it shouldn't be when importing ``main``). ``--target
+multi_agents.crew`` measures the deferred multi-agent stack itself.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --target multi_agents.crew --top 15
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _import_once(target: str) -> tuple:
+    """(wall seconds, {module: (self_us, cumulative_us)}) for one cold import of ``target``"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise SystemExit(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of the app")
+    parser.add_argument("--target", default="main", help="module to import (run from app/)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="modules to list by cumulative time")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    walls = []
+    cumulative = defaultdict(list)
+    self_times = defaultdict(list)
+    for _ in range(args.runs):
+        elapsed, modules = _import_once(args.target)
+        walls.append(elapsed)
+        for name, (self_us, cumulative_us) in modules.items():
+            self_times[name].append(self_us)
+            cumulative[name].append(cumulative_us)
+
+    cumulative_ms = {
+        name: statistics.median(values) / 1000
+        for name, values in cumulative.items()
+    }
+    slowest = sorted(cumulative_ms.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    crewai_loaded = any(name == "crewai" or name.startswith("crewai.") for name in cumulative)
+
+    print(f"import {args.target}: median {statistics.median(walls) * 1000:.0f}ms "
+          f"over {args.runs} cold runs (interpreter start included)")
+    print(f"crewai imported: {'yes' if crewai_loaded else 'no'}")
+    print(f"\n{'cumulative':>11} {'self':>9}  module")
+    for name, ms in slowest:
+        print(f"{ms:>9.1f}ms {statistics.median(self_times[name]) / 1000:>7.1f}ms  {name}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"startup-{args.target}-{datetime.utcnow():%Y%m%d%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "target": args.target,
+        "runs": args.runs,
+        "median_wall_ms": round(statistics.median(walls) * 1000, 1),
+        "crewai_imported": crewai_loaded,
+        "modules": {name: round(ms, 2) for name, ms in sorted(cumulative_ms.items(), key=lambda item: -item[1])},
+    }, indent=2))
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
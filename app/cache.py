@@ -0,0 +1,176 @@
+"""
+In-process TTL/LRU cache for read results.
+
+Entries carry tags such as ``("club", 3)`` or ``("skills",)``; writers call
+``invalidate()`` with the tags of the rows they changed once their transaction
+has committed, and every entry carrying one of those tags is dropped.
+Listeners registered with ``on_invalidate()`` are told about each invalidation,
+so other in-memory structures can follow the same signals.
+
+The cache is per process: with several workers each keeps its own copy, and
+the TTLs bound how stale a copy in another worker can get.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, Counter
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class TTLCache:
+    """Bounded mapping with per-entry expiry, LRU eviction and tag invalidation"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set of keys
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; a result computed before one is not stored
+        self._epoch = 0
+        self._counters = Counter()
+        self._namespaces = {}
+
+    def token(self) -> int:
+        """Take before computing a value, pass to set()"""
+        return self._epoch
+
+    def get(self, key):
+        namespace = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            stats = self._namespaces.setdefault(namespace, Counter())
+            if entry is None:
+                self._counters["misses"] += 1
+                stats["misses"] += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float, tags=(), token: int = None):
+        with self._lock:
+            if token is not None and token != self._epoch:
+                # Something was invalidated while the value was being computed
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, *tags) -> int:
+        with self._lock:
+            self._epoch += 1
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            self._counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._counters["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._counters["hits"],
+                "misses": self._counters["misses"],
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else None,
+                "evictions": self._counters["evictions"],
+                "expirations": self._counters["expirations"],
+                "invalidations": self._counters["invalidations"],
+                "namespaces": {name: dict(counts) for name, counts in self._namespaces.items()},
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_listeners = []
+
+
+def enabled() -> bool:
+    return _env_bool("CACHE_ENABLED", True)
+
+
+def get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTLCache(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", 2048)))
+    return _cache
+
+
+def normalize_params(params) -> tuple:
+    """Hashable, order-independent form of a parameters dict"""
+    if isinstance(params, dict):
+        return tuple(sorted(
+            (key, normalize_params(value)) for key, value in params.items() if value is not None
+        ))
+    if isinstance(params, (list, tuple, set)):
+        items = [normalize_params(value) for value in params]
+        return tuple(sorted(items, key=repr) if isinstance(params, set) else items)
+    if isinstance(params, str):
+        value = params.strip()
+        # LLM callers send ids as "12" as often as 12
+        return int(value) if value.isdigit() else value
+    return params
+
+
+def on_invalidate(callback):
+    """Register callback(tags) to run after every invalidate() call"""
+    _listeners.append(callback)
+    return callback
+
+
+def invalidate(*tags):
+    """Drop every cached entry carrying one of ``tags``; call after the write commits"""
+    removed = get_cache().invalidate(*tags)
+    logger.debug(f"Cache invalidated {tags}: {removed} entries")
+    for callback in _listeners:
+        try:
+            callback(tags)
+        except Exception:
+            logger.exception(f"Cache invalidation listener {callback!r} failed")
+
+
+def stats() -> dict:
+    return {"enabled": enabled(), **get_cache().stats()}
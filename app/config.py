@@ -0,0 +1,36 @@
+"""
+Application settings, read once from the environment (and .env) and cached.
+
+Tuning knobs that benchmarks change at runtime (DB pool, cache, profiling,
+workers) are still read with os.getenv where they are used; this holds the
+settings the app needs once at startup: the LLM and token signing.
+"""
+from functools import lru_cache
+from typing import Optional
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # LLM shared by every agent
+    model_name: str = Field("gpt-4o-mini", validation_alias=AliasChoices("MODEL_NAME", "CREWAI_MODEL"))
+    llm_api_key: Optional[str] = Field(None, validation_alias=AliasChoices("OPENAI_API_KEY", "OPENROUTER_API_KEY"))
+    llm_base_url: str = Field(OPENROUTER_BASE_URL, validation_alias=AliasChoices("OPENAI_API_BASE", "LLM_BASE_URL"))
+    llm_temperature: float = Field(0.7, validation_alias=AliasChoices("LLM_TEMPERATURE", "CREWAI_TEMPERATURE"))
+
+    # JWT
+    secret_key: Optional[str] = Field(None, validation_alias="SECRET_KEY")
+    algorithm: str = Field("HS256", validation_alias=AliasChoices("ALGORITHM", "JWT_ALGORITHM"))
+    access_token_expire_minutes: int = Field(30, validation_alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+
+    # Import the multi-agent stack in the background at startup instead of on the first agent request
+    crew_preload: bool = Field(True, validation_alias="CREW_PRELOAD")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
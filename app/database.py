@@ -1,47 +1,338 @@
 import os
+import time
+import logging
+import itertools
+import threading
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlprofile import instrument
 
 # Try multiple paths for .env file
 load_dotenv(dotenv_path="../.env.test")
 load_dotenv(dotenv_path=".env")
 load_dotenv()  # Look in current directory
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
+_engine = None
+_SessionLocal = None
+_engine_lock = threading.Lock()
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+_replicas = None
+
+# Async drivers used for each sync dialect
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _normalize_url(url: str) -> str:
+    if url.startswith('postgres://'):
+        url = url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+
+def _to_async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect in _ASYNC_DRIVERS:
+        scheme = _ASYNC_DRIVERS[dialect]
+    if scheme == "postgresql+asyncpg":
+        # asyncpg takes "ssl" instead of libpq's "sslmode"
+        rest = rest.replace("sslmode=", "ssl=")
+    return f"{scheme}://{rest}"
+
+
+def _safe_url(url: str) -> str:
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def get_database_url() -> str:
+    return _normalize_url(os.getenv('DATABASE_URL'))
+
+
+def get_replica_urls() -> list:
+    """Read replicas from DATABASE_REPLICA_URLS (comma separated)"""
+    urls = os.getenv("DATABASE_REPLICA_URLS", "")
+    return [_normalize_url(u.strip()) for u in urls.split(",") if u.strip()]
+
+
+def _engine_options(url: str) -> dict:
+    """Pool settings for create_engine, read from the environment"""
+    options = {
+        "echo": _env_bool("DB_ECHO", False),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+    # SQLite uses its own pool classes that don't accept sizing arguments
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        )
+    return options
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, skipping the ones that failed a health check"""
+
+    def __init__(self, urls: list, retry_after: float, health_interval: float):
+        self.urls = urls
+        self.retry_after = retry_after
+        self.health_interval = health_interval
+        self._down_until = {}
+        self._engines = {}
+        self._sessionmakers = {}
+        self._async_engines = {}
+        self._async_sessionmakers = {}
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._stop = threading.Event()
+
+    def choose(self):
+        """Next healthy replica URL, or None when every replica is down"""
+        self._start_health_checks()
+        for _ in range(len(self.urls)):
+            url = self.urls[next(self._cursor) % len(self.urls)]
+            if self.is_healthy(url):
+                return url
+        return None
+
+    def mark_down(self, url: str):
+        logger.warning(f"Read replica {_safe_url(url)} marked down for {self.retry_after}s")
+        self._down_until[url] = time.monotonic() + self.retry_after
+
+    def is_healthy(self, url: str) -> bool:
+        return self._down_until.get(url, 0) <= time.monotonic()
+
+    def engine(self, url: str):
+        if url not in self._engines:
+            with self._lock:
+                if url not in self._engines:
+                    engine = instrument(create_engine(url, **_engine_options(url)))
+                    self._sessionmakers[url] = sessionmaker(bind=engine)
+                    self._engines[url] = engine
+        return self._engines[url]
+
+    def session(self, url: str):
+        self.engine(url)
+        session = self._sessionmakers[url]()
+        session.info["replica"] = url
+        return session
+
+    def async_session(self, url: str):
+        if url not in self._async_engines:
+            with self._lock:
+                if url not in self._async_engines:
+                    async_url = _to_async_url(url)
+                    engine = create_async_engine(async_url, **_engine_options(async_url))
+                    instrument(engine.sync_engine)
+                    self._async_sessionmakers[url] = async_sessionmaker(
+                        bind=engine, expire_on_commit=False
+                    )
+                    self._async_engines[url] = engine
+        session = self._async_sessionmakers[url]()
+        session.info["replica"] = url
+        return session
+
+    def check_health(self):
+        for url in self.urls:
+            try:
+                with self.engine(url).connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self._down_until.pop(url, None)
+            except Exception:
+                self.mark_down(url)
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.check_health()
+
+    def _start_health_checks(self):
+        if self._health_thread is None:
+            with self._lock:
+                if self._health_thread is None:
+                    self._health_thread = threading.Thread(
+                        target=self._health_loop, name="replica-health", daemon=True
+                    )
+                    self._health_thread.start()
+
+    def status(self) -> list:
+        return [
+            {
+                "url": _safe_url(url),
+                "healthy": self.is_healthy(url),
+                "pool": _pool_snapshot(self._engines[url].pool) if url in self._engines else None,
+            }
+            for url in self.urls
+        ]
+
+    def dispose(self):
+        self._stop.set()
+        for engine in self._engines.values():
+            engine.dispose()
+        self._engines.clear()
+        self._sessionmakers.clear()
+
+    async def dispose_async(self):
+        engines = list(self._async_engines.values())
+        self._async_engines.clear()
+        self._async_sessionmakers.clear()
+        for engine in engines:
+            await engine.dispose()
+
+
+def get_replicas():
+    """Return the process-wide ReplicaSet, or None when no replica is configured"""
+    global _replicas
+    if _replicas is None:
+        urls = get_replica_urls()
+        if not urls:
+            return None
+        with _engine_lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(
+                    urls,
+                    retry_after=float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30)),
+                    health_interval=float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", 15)),
+                )
+                _replicas._start_health_checks()
+    return _replicas
+
+
 def get_engine():
-    DATABASE_URL = os.getenv('DATABASE_URL')
+    """Return the process-wide engine, creating it on first use"""
+    global _engine, _SessionLocal
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                DATABASE_URL = get_database_url()
+                # Removed print statement to avoid exposing secrets in logs
+                _engine = instrument(create_engine(DATABASE_URL, **_engine_options(DATABASE_URL)))
+                _SessionLocal = sessionmaker(bind=_engine)
+    return _engine
+
+
+def dispose_engine():
+    """Close every pooled connection and forget the engines"""
+    global _engine, _SessionLocal, _replicas
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _SessionLocal = None
+        if _replicas is not None:
+            _replicas.dispose()
+        _replicas = None
+
+
+def get_async_database_url() -> str:
+    """DATABASE_URL rewritten for the async driver (asyncpg / aiosqlite)"""
+    return _to_async_url(os.getenv("ASYNC_DATABASE_URL") or get_database_url())
+
+
+def get_async_engine():
+    """Return the process-wide async engine, creating it on first use"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                url = get_async_database_url()
+                _async_engine = create_async_engine(url, **_engine_options(url))
+                instrument(_async_engine.sync_engine)
+                _AsyncSessionLocal = async_sessionmaker(
+                    bind=_async_engine, expire_on_commit=False
+                )
+    return _async_engine
 
-    if DATABASE_URL.startswith('postgres://'):
-        DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
-    
-    # Removed print statement to avoid exposing secrets in logs
-    return create_engine(DATABASE_URL, echo=True)
 
+async def dispose_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    engine = _async_engine
+    _async_engine = None
+    _AsyncSessionLocal = None
+    if engine is not None:
+        await engine.dispose()
+    if _replicas is not None:
+        await _replicas.dispose_async()
+
+
+def _pool_snapshot(pool) -> dict:
+    status = {"pool_class": type(pool).__name__}
+    # Only QueuePool tracks checkouts and overflow
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=getattr(pool, "_max_overflow", None),
+        )
+    return status
+
+
+def get_pool_status() -> dict:
+    """Snapshot of the connection pools, used to size DB_POOL_SIZE/DB_MAX_OVERFLOW"""
+    status = {"sync": _pool_snapshot(get_engine().pool)}
+    if _async_engine is not None:
+        status["async"] = _pool_snapshot(_async_engine.pool)
+    replicas = get_replicas()
+    if replicas is not None:
+        status["replicas"] = replicas.status()
+    return status
 
 
 def init_db():
+    """Bring the schema up to date by applying pending migrations"""
+    from migrations import upgrade
 
-    from models.student import Student, StudentProfile
-    from models.club import Club
-    from models.event import Event
-    from models.skils import Skill
-    from models.relations import (
-        student_skills, event_skills,
-        event_registrations, club_members
-    )
-    
-    engine = get_engine()
-    Base.metadata.create_all(engine)
-    print("✅ Database tables created successfully!")
+    applied = upgrade(get_engine())
+    print(f"✅ Database up to date ({len(applied)} migration(s) applied)")
 
 
-def get_session():
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+def get_session(read_only: bool = False):
+    """Open a session; read_only sessions go to a healthy replica when one is configured"""
+    if read_only:
+        replicas = get_replicas()
+        while replicas is not None and (url := replicas.choose()) is not None:
+            session = replicas.session(url)
+            try:
+                # Connect now so a replica that is down falls through to the next one, then the primary
+                session.connection()
+                return session
+            except OperationalError:
+                session.close()
+                replicas.mark_down(url)
+    get_engine()
+    return _SessionLocal()
+
+
+def mark_replica_down(session):
+    """Take the session's replica out of rotation after it failed mid-request; no-op on the primary"""
+    replica = session.info.get("replica")
+    if replica is not None:
+        get_replicas().mark_down(replica)
+    return replica
 
 
 def get_db():
@@ -53,5 +344,58 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+
+    db = get_session(read_only=True)
+    try:
+        yield db
+    except OperationalError:
+        mark_replica_down(db)
+        raise
+    finally:
+        db.close()
+
+
+def get_async_session(read_only: bool = False):
+    if read_only:
+        replicas = get_replicas()
+        url = replicas.choose() if replicas is not None else None
+        if url is not None:
+            return replicas.async_session(url)
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db():
+    async with get_async_session() as db:
+        yield db
+
+
+async def get_async_read_session():
+    """get_session(read_only=True) for async code: a connected replica session, or a primary one"""
+    replicas = get_replicas()
+    while replicas is not None and (url := replicas.choose()) is not None:
+        session = replicas.async_session(url)
+        try:
+            await session.connection()
+            return session
+        except OperationalError:
+            await session.close()
+            replicas.mark_down(url)
+    return get_async_session()
+
+
+async def get_async_read_db():
+    db = await get_async_read_session()
+    try:
+        yield db
+    except OperationalError:
+        # Too late to retry this request; the next ones go elsewhere
+        mark_replica_down(db)
+        raise
+    finally:
+        await db.close()
+
+
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
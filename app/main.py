@@ -5,14 +5,39 @@ from api.routers.student import student
 from api.routers.club import club
 from api.routers.events import  events
 from api.routers.skills import skills
-from fastapi import FastAPI
+from api.routers.health import health
+from api.routers.exports import exports
+from api.routers.jobs import jobs
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from database import dispose_engine, dispose_async_engine
+from workers import trending, view_counter
+from multi_agents import executor, registry
+from config import get_settings
+import sqlprofile
+from pagination import NEXT_CURSOR_HEADER
 
 
 
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    trending.start()
+    view_counter.start()
+    if get_settings().crew_preload:
+        registry.preload()
+    yield
+    view_counter.stop()
+    trending.stop()
+    executor.shutdown()
+    await dispose_async_engine()
+    dispose_engine()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +50,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+
+@app.exception_handler(executor.CrewQueueFull)
+async def crew_queue_full(request: Request, exc: executor.CrewQueueFull):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.middleware("http")
+async def sql_profiling(request: Request, call_next):
+    # Debug mode reports through response headers, otherwise one structured log line
+    debug = sqlprofile.debug_mode()
+    with sqlprofile.profile(f"{request.method} {request.url.path}", log=not debug) as prof:
+        response = await call_next(request)
+    if debug:
+        response.headers.update(prof.headers())
+    return response
+
 app.include_router(chat.router)
 app.include_router(master.router)
 app.include_router(recommendations.router)
@@ -36,6 +82,9 @@ app.include_router(student.router)
 app.include_router(club.router)
 app.include_router(events.router)
 app.include_router(skills.router)
+app.include_router(health.router)
+app.include_router(exports.router)
+app.include_router(jobs.router)
 
 
 
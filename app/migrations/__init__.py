@@ -0,0 +1,100 @@
+"""
+Versioned schema migrations.
+
+Each module in ``migrations/versions`` defines ``revision``, ``description``
+and ``upgrade(conn)``. Applied revisions are recorded in ``schema_migrations``.
+Migrations that build indexes online (``CREATE INDEX CONCURRENTLY``) set
+``transactional = False`` and run on an autocommit connection, so they must be
+safe to re-run after a partial failure.
+
+    python -m migrations status
+    python -m migrations upgrade
+"""
+import hashlib
+import logging
+import importlib
+import pkgutil
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, String, DateTime, select, text
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations',
+    _metadata,
+    Column('revision', String(32), primary_key=True),
+    Column('description', String(200)),
+    Column('applied_at', DateTime, default=datetime.utcnow)
+)
+
+# Arbitrary key so concurrent upgrades on Postgres serialize
+_LOCK_KEY = int(hashlib.sha1(b"clubevent-hub-migrations").hexdigest()[:15], 16)
+
+
+def discover() -> list:
+    """All migration modules, ordered by revision"""
+    from . import versions
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    return sorted(modules, key=lambda m: m.revision)
+
+
+def applied_revisions(engine) -> set:
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.revision)).scalars())
+
+
+def status(engine) -> list:
+    applied = applied_revisions(engine)
+    return [
+        {"revision": m.revision, "description": m.description, "applied": m.revision in applied}
+        for m in discover()
+    ]
+
+
+def pending(engine) -> list:
+    applied = applied_revisions(engine)
+    return [m for m in discover() if m.revision not in applied]
+
+
+def _apply(engine, migration):
+    logger.info(f"Applying migration {migration.revision}: {migration.description}")
+    if getattr(migration, "transactional", True):
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                revision=migration.revision, description=migration.description
+            ))
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        migration.upgrade(conn)
+    with engine.begin() as conn:
+        conn.execute(schema_migrations.insert().values(
+            revision=migration.revision, description=migration.description
+        ))
+
+
+def upgrade(engine) -> list:
+    """Apply every pending migration in order; returns the applied revisions"""
+    schema_migrations.create(engine, checkfirst=True)
+    is_postgres = engine.dialect.name == "postgresql"
+    lock_conn = engine.connect() if is_postgres else None
+    try:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+            lock_conn.commit()
+        applied = []
+        for migration in pending(engine):
+            _apply(engine, migration)
+            applied.append(migration.revision)
+        return applied
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+            lock_conn.commit()
+            lock_conn.close()
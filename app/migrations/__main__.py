@@ -0,0 +1,28 @@
+import sys
+import argparse
+import logging
+from database import get_engine
+from . import status, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("command", choices=["status", "upgrade"])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    engine = get_engine()
+    if args.command == "upgrade":
+        applied = upgrade(engine)
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none'}")
+        return 0
+
+    rows = status(engine)
+    for row in rows:
+        mark = "applied" if row["applied"] else "PENDING"
+        print(f"  {row['revision']}  [{mark:>7}]  {row['description']}")
+    return 0 if all(row["applied"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
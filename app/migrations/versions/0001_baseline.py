@@ -0,0 +1,133 @@
+"""
+Baseline schema: the tables as the models first defined them, plus the login
+columns that older databases were created without (previously checked by
+verify.py).
+
+The tables are frozen here rather than taken from ``Base.metadata``, so a
+fresh database goes through every later migration instead of starting from
+today's models.
+"""
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, inspect, text
+)
+
+revision = "0001"
+description = "Baseline tables and login columns"
+
+# (table, column, DDL type) added to databases that predate authentication
+_LOGIN_COLUMNS = [
+    ("students", "password_hash", "VARCHAR(255)"),
+    ("clubs", "email", "VARCHAR(100)"),
+    ("clubs", "password_hash", "VARCHAR(255)"),
+]
+
+_metadata = MetaData()
+
+Table(
+    'students',
+    _metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('name', String(100), nullable=False),
+    Column('email', String(100), unique=True, nullable=False, index=True),
+    Column('password_hash', String(255), nullable=False),
+    Column('field_of_study', String(100)),
+    Column('year_level', Integer),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+Table(
+    'student_profiles',
+    _metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE'), unique=True, nullable=False),
+    Column('bio', Text),
+    Column('goals', Text),
+    Column('notification_preferences', Text),
+    Column('last_updated', DateTime)
+)
+
+Table(
+    'clubs',
+    _metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('name', String(100), nullable=False, unique=True, index=True),
+    Column('email', String(100), unique=True, nullable=False, index=True),
+    Column('password_hash', String(255), nullable=False),
+    Column('description', Text),
+    Column('mission', Text),
+    Column('history', Text),
+    Column('contact_email', String(100)),
+    Column('website', String(200)),
+    Column('logo_url', String(200)),
+    Column('personality_style', String(50)),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+Table(
+    'events',
+    _metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('club_id', Integer, ForeignKey('clubs.id', ondelete='CASCADE'), nullable=False),
+    Column('title', String(200), nullable=False, index=True),
+    Column('description', Text),
+    Column('event_type', String(50), index=True),
+    Column('location', String(200)),
+    Column('date', DateTime, nullable=False, index=True),
+    Column('deadline', DateTime),
+    Column('max_seats', Integer),
+    Column('current_registrations', Integer),
+    Column('is_trending', Boolean, index=True),
+    Column('view_count', Integer),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+Table(
+    'skills',
+    _metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('name', String(100), unique=True, nullable=False, index=True),
+    Column('category', String(50), index=True)
+)
+
+Table(
+    'student_skills',
+    _metadata,
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
+    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'))
+)
+
+Table(
+    'event_skills',
+    _metadata,
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE')),
+    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'))
+)
+
+Table(
+    'event_registrations',
+    _metadata,
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE')),
+    Column('registered_at', DateTime)
+)
+
+Table(
+    'club_members',
+    _metadata,
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
+    Column('club_id', Integer, ForeignKey('clubs.id', ondelete='CASCADE')),
+    Column('joined_at', DateTime),
+    Column('role', String(50))
+)
+
+
+def upgrade(conn):
+    _metadata.create_all(conn)
+    inspector = inspect(conn)
+    for table, column, ddl_type in _LOGIN_COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
@@ -0,0 +1,77 @@
+"""
+Composite primary keys and reverse-direction indexes on the association tables.
+
+Existing duplicate rows (and rows with a NULL key) are removed first. On
+Postgres the key is built with CREATE UNIQUE INDEX CONCURRENTLY and then
+attached as the primary key, so writers are only blocked for the final
+ALTER TABLE. SQLite cannot add a primary key to an existing table; there a
+unique index on the same columns enforces the key.
+"""
+from sqlalchemy import inspect, text
+
+revision = "0002"
+description = "Composite keys and reverse indexes on association tables"
+transactional = False
+
+# table -> (key columns, reverse-direction column)
+ASSOCIATIONS = {
+    "student_skills": (("student_id", "skill_id"), "skill_id"),
+    "event_skills": (("event_id", "skill_id"), "skill_id"),
+    "event_registrations": (("student_id", "event_id"), "event_id"),
+    "club_members": (("student_id", "club_id"), "club_id"),
+}
+
+
+def _deduplicate(conn, table, keys):
+    dialect = conn.dialect.name
+    not_null = " OR ".join(f"{k} IS NULL" for k in keys)
+    conn.execute(text(f"DELETE FROM {table} WHERE {not_null}"))
+    if dialect == "postgresql":
+        same_key = " AND ".join(f"a.{k} = b.{k}" for k in keys)
+        conn.execute(text(
+            f"DELETE FROM {table} a USING {table} b WHERE a.ctid > b.ctid AND {same_key}"
+        ))
+    else:
+        group = ", ".join(keys)
+        conn.execute(text(
+            f"DELETE FROM {table} WHERE rowid NOT IN "
+            f"(SELECT MIN(rowid) FROM {table} GROUP BY {group})"
+        ))
+
+
+def _add_key_postgres(conn, table, keys):
+    index = f"{table}_pkey_idx"
+    try:
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} ({', '.join(keys)})"
+        ))
+    except Exception:
+        # A duplicate slipped in during the build; leave nothing invalid behind so a re-run works
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index}"))
+        raise
+    conn.execute(text(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY USING INDEX {index}"
+    ))
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    dialect = conn.dialect.name
+    concurrently = "CONCURRENTLY " if dialect == "postgresql" else ""
+
+    for table, (keys, reverse) in ASSOCIATIONS.items():
+        has_key = inspector.get_pk_constraint(table).get("constrained_columns")
+        if not has_key:
+            _deduplicate(conn, table, keys)
+            if dialect == "postgresql":
+                _add_key_postgres(conn, table, keys)
+            elif dialect == "sqlite":
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table} ON {table} ({', '.join(keys)})"
+                ))
+            else:
+                conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(keys)})"))
+
+        conn.execute(text(
+            f"CREATE INDEX {concurrently}IF NOT EXISTS ix_{table}_{reverse} ON {table} ({reverse})"
+        ))
@@ -0,0 +1,76 @@
+"""
+Full-text index on events (title, event_type, description).
+
+Postgres gets a stored generated ``search_vector`` tsvector column, weighted
+title > event_type > description, and a GIN index built concurrently. The
+column is maintained by Postgres on every insert and update.
+
+SQLite gets an external-content FTS5 table ``events_fts``, filled from the
+existing rows and kept in sync by insert/update/delete triggers. If the
+SQLite build has no FTS5 the migration does nothing and search keeps using
+ILIKE.
+"""
+from sqlalchemy import text
+from search.fulltext import fts5_available
+
+revision = "0003"
+description = "Full-text search index on events"
+transactional = False
+
+_TSVECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(event_type, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+_FTS_COLUMNS = "title, description, event_type"
+
+
+def _upgrade_postgres(conn):
+    conn.execute(text(
+        f"ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_TSVECTOR}) STORED"
+    ))
+    try:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_search_vector "
+            "ON events USING GIN (search_vector)"
+        ))
+    except Exception:
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_events_search_vector"))
+        raise
+
+
+def _upgrade_sqlite(conn):
+    if not fts5_available():
+        return
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+        f"{_FTS_COLUMNS}, content='events', content_rowid='id')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN "
+        f"INSERT INTO events_fts(rowid, {_FTS_COLUMNS}) "
+        f"VALUES (new.id, new.title, new.description, new.event_type); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN "
+        f"INSERT INTO events_fts(events_fts, rowid, {_FTS_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.title, old.description, old.event_type); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_update "
+        f"AFTER UPDATE OF title, description, event_type ON events BEGIN "
+        f"INSERT INTO events_fts(events_fts, rowid, {_FTS_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.title, old.description, old.event_type); "
+        f"INSERT INTO events_fts(rowid, {_FTS_COLUMNS}) "
+        f"VALUES (new.id, new.title, new.description, new.event_type); END"
+    ))
+    conn.execute(text("INSERT INTO events_fts(events_fts) VALUES ('rebuild')"))
+
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        _upgrade_postgres(conn)
+    elif conn.dialect.name == "sqlite":
+        _upgrade_sqlite(conn)
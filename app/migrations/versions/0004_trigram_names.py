@@ -0,0 +1,40 @@
+"""
+Trigram indexes for fuzzy club and skill name lookup (Postgres only).
+
+Enables pg_trgm and builds GIN trigram indexes on lower(name) concurrently.
+Creating the extension needs a privileged role; without it the migration
+logs a warning and skips the indexes, and lookups use the in-memory trigram
+index instead. Other databases always use the in-memory index.
+"""
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+revision = "0004"
+description = "Trigram indexes on club and skill names"
+transactional = False
+
+_INDEXES = {
+    "ix_clubs_name_trgm": "clubs",
+    "ix_skills_name_trgm": "skills",
+}
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    try:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        logger.warning(f"pg_trgm unavailable, fuzzy name lookup stays in memory: {e}")
+        return
+    for index, table in _INDEXES.items():
+        try:
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+                f"ON {table} USING GIN (lower(name) gin_trgm_ops)"
+            ))
+        except Exception:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index}"))
+            raise
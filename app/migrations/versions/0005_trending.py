@@ -0,0 +1,39 @@
+"""
+Rolling trending scores: the event_activity_buckets table and an indexed
+events.trending_score column maintained by workers/trending.py.
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, DateTime, ForeignKey, inspect, text
+
+revision = "0005"
+description = "Event activity buckets and trending_score"
+transactional = False
+
+# Frozen copy of models.event_activity_buckets as this revision created it
+_metadata = MetaData()
+Table('events', _metadata, Column('id', Integer, primary_key=True))
+event_activity_buckets = Table(
+    'event_activity_buckets',
+    _metadata,
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
+    Column('bucket_start', DateTime, primary_key=True, index=True),
+    Column('views', Integer, nullable=False),
+    Column('registrations', Integer, nullable=False)
+)
+
+
+def upgrade(conn):
+    event_activity_buckets.create(conn, checkfirst=True)
+    columns = {column["name"] for column in inspect(conn).get_columns("events")}
+    if "trending_score" not in columns:
+        # Constant default: no table rewrite on Postgres 11+
+        conn.execute(text("ALTER TABLE events ADD COLUMN trending_score FLOAT NOT NULL DEFAULT 0"))
+    if conn.dialect.name == "postgresql":
+        try:
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_trending_score ON events (trending_score)"
+            ))
+        except Exception:
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_events_trending_score"))
+            raise
+    else:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_events_trending_score ON events (trending_score)"))
@@ -1,4 +1,8 @@
-from database import Base, get_engine, init_db, get_session, get_db
+from database import (
+    Base, get_engine, dispose_engine, get_pool_status, init_db, get_session, get_db,
+    get_read_db, get_replicas, mark_replica_down, get_async_engine, get_async_session,
+    get_async_read_session, get_async_db, get_async_read_db
+)
 from .student import Student, StudentProfile
 from .club import Club
 from .event import Event
@@ -9,13 +13,24 @@ from .relations import (
     event_registrations,
     club_members
 )
+from .activity import event_activity_buckets
 
 __all__ = [
     'Base',
     'get_engine',
+    'dispose_engine',
+    'get_pool_status',
     'init_db',
     'get_session',
     'get_db',
+    'get_read_db',
+    'get_replicas',
+    'mark_replica_down',
+    'get_async_engine',
+    'get_async_session',
+    'get_async_read_session',
+    'get_async_db',
+    'get_async_read_db',
     'Student',
     'StudentProfile',
     'Club',
@@ -24,5 +39,6 @@ __all__ = [
     'student_skills',
     'event_skills',
     'event_registrations',
-    'club_members'
+    'club_members',
+    'event_activity_buckets'
 ]
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Table, Column, Integer, DateTime, ForeignKey
+from database import Base
+
+
+# Views and registrations per event per time bucket (TRENDING_BUCKET_MINUTES wide);
+# the trending job reads a sliding window of these instead of the raw counters.
+event_activity_buckets = Table(
+    'event_activity_buckets',
+    Base.metadata,
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
+    Column('bucket_start', DateTime, primary_key=True, index=True),
+    Column('views', Integer, nullable=False, default=0),
+    Column('registrations', Integer, nullable=False, default=0)
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -20,6 +20,7 @@ class Event(Base):
     current_registrations = Column(Integer, default=0)
     is_trending = Column(Boolean, default=False, index=True)
     view_count = Column(Integer, default=0)
+    trending_score = Column(Float, default=0, nullable=False, index=True)  # refreshed by workers/trending.py
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
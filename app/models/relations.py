@@ -1,36 +1,42 @@
-from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey, Index
 from datetime import datetime
 from database import Base
 
 
+# Each association is keyed on its pair; the reverse-direction index serves
+# lookups from the second side (e.g. "students with skill X").
 
 student_skills = Table(
     'student_skills',
     Base.metadata,
-    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
-    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'))
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_student_skills_skill_id', 'skill_id')
 )
 
 event_skills = Table(
     'event_skills',
     Base.metadata,
-    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE')),
-    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'))
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
+    Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_event_skills_skill_id', 'skill_id')
 )
 
 event_registrations = Table(
     'event_registrations',
     Base.metadata,
-    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
-    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE')),
-    Column('registered_at', DateTime, default=datetime.utcnow)
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+    Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
+    Column('registered_at', DateTime, default=datetime.utcnow),
+    Index('ix_event_registrations_event_id', 'event_id')
 )
 
 club_members = Table(
     'club_members',
     Base.metadata,
-    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE')),
-    Column('club_id', Integer, ForeignKey('clubs.id', ondelete='CASCADE')),
+    Column('student_id', Integer, ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+    Column('club_id', Integer, ForeignKey('clubs.id', ondelete='CASCADE'), primary_key=True),
     Column('joined_at', DateTime, default=datetime.utcnow),
-    Column('role', String(50), default='member')
-)
\ No newline at end of file
+    Column('role', String(50), default='member'),
+    Index('ix_club_members_club_id', 'club_id')
+)
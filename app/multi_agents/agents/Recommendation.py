@@ -1,23 +1,6 @@
 from crewai import Agent
 from ..tools.databasetool import DatabaseTool
-import os
-from dotenv import load_dotenv
-from .openrouter import OpenRouterLLM
-
-
-load_dotenv()
-
-
-
-
-
-load_dotenv()
-
-MODEL = OpenRouterLLM(
-    model=os.getenv("MODEL_NAME", "gpt-4o-mini"),
-    api_key=os.getenv("OPENAI_API_KEY"),  # CrewAI lit ici
-    base_url=os.getenv("OPENAI_API_BASE", "https://openrouter.ai/api/v1")
-)
+from .openrouter import get_llm
 
 
 def create_recommendation_agent() -> Agent:
@@ -35,6 +18,6 @@ def create_recommendation_agent() -> Agent:
            tools=[
             DatabaseTool()
         ],
-        llm= MODEL,
+        llm=get_llm(),
          memory=True
     )
\ No newline at end of file
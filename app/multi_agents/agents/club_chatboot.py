@@ -1,23 +1,6 @@
 from crewai import Agent
 from ..tools.databasetool import DatabaseTool
-import os
-from dotenv import load_dotenv
-from .openrouter import OpenRouterLLM
-
-
-load_dotenv()
-
-
-
-
-
-load_dotenv()
-
-MODEL = OpenRouterLLM(
-    model=os.getenv("MODEL_NAME", "gpt-4o-mini"),
-    api_key=os.getenv("OPENAI_API_KEY"),  # CrewAI lit ici
-    base_url=os.getenv("OPENAI_API_BASE", "https://openrouter.ai/api/v1")
-)
+from .openrouter import get_llm
 
 
 def create_club_chatbot(club_id: str, club_personality: str = "friendly") -> Agent:
@@ -32,6 +15,6 @@ def create_club_chatbot(club_id: str, club_personality: str = "friendly") -> Age
         with applications, share links, and explain requirements clearly.""",
         verbose=True,
         allow_delegation=False,
-        llm=MODEL ,
+        llm=get_llm(),
         memory=True
     )
\ No newline at end of file
@@ -1,22 +1,6 @@
 from crewai import Agent
 from ..tools.databasetool import DatabaseTool
-import os
-from dotenv import load_dotenv
-from .openrouter import OpenRouterLLM
-
-
-load_dotenv()
-
-
-
-
-
-load_dotenv()
-MODEL = OpenRouterLLM(
-    model=os.getenv("MODEL_NAME", "gpt-4o-mini"),
-    api_key=os.getenv("OPENAI_API_KEY"),  # CrewAI lit ici
-    base_url=os.getenv("OPENAI_API_BASE", "https://openrouter.ai/api/v1")
-)
+from .openrouter import get_llm
 
 
 
@@ -34,6 +18,6 @@ def create_master_orchestrator() -> Agent:
          tools=[
             DatabaseTool()
         ],
-        llm= MODEL,
+        llm=get_llm(),
          memory=True
     )
\ No newline at end of file
@@ -1,12 +1,30 @@
 # openrouter_llm.py
-import os
+from functools import lru_cache
 from crewai import LLM
+from config import OPENROUTER_BASE_URL, get_settings
+
 
 class OpenRouterLLM(LLM):
-    def __init__(self, model="gpt-4o-mini", temperature=0.7):
+    # crewai's LLM.__new__ hands models it knows to a native client, so this
+    # only runs on the LiteLLM fallback; it must accept what callers pass
+    def __init__(self, model="gpt-4o-mini", temperature=0.7, api_key=None, base_url=OPENROUTER_BASE_URL, **kwargs):
         super().__init__(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url="https://openrouter.ai/api/v1"
+            api_key=api_key or get_settings().llm_api_key,
+            base_url=base_url,
+            **kwargs
         )
+
+
+@lru_cache(maxsize=2)
+def get_llm(stream: bool = False) -> LLM:
+    """The LLM client shared by every agent; stream=True for runs behind the SSE endpoints"""
+    settings = get_settings()
+    return OpenRouterLLM(
+        model=settings.model_name,
+        temperature=settings.llm_temperature,
+        api_key=settings.llm_api_key,
+        base_url=settings.llm_base_url,
+        stream=stream
+    )
@@ -1,43 +1,64 @@
 from crewai import Crew, Process
-from .agents.master import create_master_orchestrator
-from .agents.club_chatboot import create_club_chatbot
-from .agents.Recommendation import create_recommendation_agent
-from .agents.search_agent import create_search_agent
-from .agents.onboarding_agent import create_onboarding_agent
 from .tasks.master_task import create_routing_task
 from .tasks.recemndation import create_weekly_digest_task
 from .tasks.clubchatboot import create_club_info_task
 from .tasks.onboarding import create_onboarding_task
 from .tasks.recemndation import create_personalized_recommendations_task
 from .tasks.search_tasks import create_search_task
+from models import get_session
+from search.query_understanding import understand as understand_query
+from .executor import run_crew
+from . import streaming
+from .registry import AgentRegistry, get_agents
 from typing import Dict, Any
 
+
+def _for_run(agent, stream=None):
+    # An Agent keeps its executor on itself while a task runs, so runs on
+    # different executor threads each get their own copy
+    agent = agent.copy()
+    if stream is not None:
+        stream.attach(agent)
+    return agent
+
+
 class ClubEventHubCrew:
     
     
-    def __init__(self):
-        self.master_orchestrator = create_master_orchestrator()
-        self.recommendation_agent = create_recommendation_agent()
-        self.search_agent = create_search_agent()
-        self.onboarding_agent = create_onboarding_agent()
-        self.club_chatbots = {} 
+    def __init__(self, agents: AgentRegistry = None):
+        # Agents come from the shared registry and are only built when first used
+        self.agents = agents or get_agents()
+
+    @property
+    def master_orchestrator(self):
+        return self.agents.get("master_orchestrator")
+
+    @property
+    def recommendation_agent(self):
+        return self.agents.get("recommendation_agent")
+
+    @property
+    def search_agent(self):
+        return self.agents.get("search_agent")
+
+    @property
+    def onboarding_agent(self):
+        return self.agents.get("onboarding_agent")
     
     def get_club_chatbot(self, club_id: str, personality: str = "friendly"):
-        
-        if club_id not in self.club_chatbots:
-            self.club_chatbots[club_id] = create_club_chatbot(club_id, personality)
-        return self.club_chatbots[club_id]
+        return self.agents.club_chatbot(club_id, personality)
     
-    def process_student_query(self, student_query: str, context: Dict[str, Any] = None) -> str:
+    def process_student_query(self, student_query: str, context: Dict[str, Any] = None, stream=None) -> str:
   
         if context is None:
             context = {}
      
-        routing_task = create_routing_task(self.master_orchestrator, student_query)
+        master_orchestrator = _for_run(self.master_orchestrator, stream)
+        routing_task = create_routing_task(master_orchestrator, student_query)
         
     
         routing_crew = Crew(
-            agents=[self.master_orchestrator],
+            agents=[master_orchestrator],
             tasks=[routing_task],
             process=Process.sequential,
             verbose=True
@@ -47,12 +68,12 @@ class ClubEventHubCrew:
         
         return routing_result
     
-    def handle_club_query(self, club_id: str, student_question: str, club_personality: str = "friendly"):
+    def handle_club_query(self, club_id: str, student_question: str, club_personality: str = "friendly", stream=None):
    
    
     
         
-        club_agent = self.get_club_chatbot(club_id, club_personality)
+        club_agent = _for_run(self.get_club_chatbot(club_id, club_personality), stream)
         task = create_club_info_task(club_agent, club_id, student_question)
         
         crew = Crew(
@@ -68,10 +89,11 @@ class ClubEventHubCrew:
 
         
         
-        task = create_personalized_recommendations_task(self.recommendation_agent, student_id)
+        recommendation_agent = _for_run(self.recommendation_agent)
+        task = create_personalized_recommendations_task(recommendation_agent, student_id)
         
         crew = Crew(
-            agents=[self.recommendation_agent],
+            agents=[recommendation_agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True
@@ -79,14 +101,23 @@ class ClubEventHubCrew:
         
         return crew.kickoff()
     
-    def handle_search_query(self, search_query: str, filters: dict = None):
+    def handle_search_query(self, search_query: str, filters: dict = None, understand: bool = True):
         
-       
+        # Parse dates, event type, club and synonyms up front so the agent doesn't spend tokens on it
+        parsed = None
+        if understand:
+            session = get_session(read_only=True)
+            try:
+                parsed = understand_query(search_query, session)
+            finally:
+                session.close()
+            filters = {**parsed["filters"], **(filters or {})}
         
-        task = create_search_task(self.search_agent, search_query, filters)
+        search_agent = _for_run(self.search_agent)
+        task = create_search_task(search_agent, search_query, filters, parsed)
         
         crew = Crew(
-            agents=[self.search_agent],
+            agents=[search_agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True
@@ -98,10 +129,11 @@ class ClubEventHubCrew:
 
 
         
-        task = create_onboarding_task(self.onboarding_agent, student_id)
+        onboarding_agent = _for_run(self.onboarding_agent)
+        task = create_onboarding_task(onboarding_agent, student_id)
         
         crew = Crew(
-            agents=[self.onboarding_agent],
+            agents=[onboarding_agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True
@@ -113,13 +145,42 @@ class ClubEventHubCrew:
 
         
         
-        task = create_weekly_digest_task(self.recommendation_agent, student_id)
+        recommendation_agent = _for_run(self.recommendation_agent)
+        task = create_weekly_digest_task(recommendation_agent, student_id)
         
         crew = Crew(
-            agents=[self.recommendation_agent],
+            agents=[recommendation_agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True
         )
         
-        return crew.kickoff()
\ No newline at end of file
+        return crew.kickoff()
+
+    # Async entry points for request handlers: the blocking kickoff runs on the
+    # bounded crew executor and raises CrewQueueFull when it is saturated
+    async def process_student_query_async(self, *args, **kwargs):
+        return await run_crew(self.process_student_query, *args, **kwargs)
+
+    async def handle_club_query_async(self, *args, **kwargs):
+        return await run_crew(self.handle_club_query, *args, **kwargs)
+
+    async def handle_recommendation_request_async(self, *args, **kwargs):
+        return await run_crew(self.handle_recommendation_request, *args, **kwargs)
+
+    async def handle_search_query_async(self, *args, **kwargs):
+        return await run_crew(self.handle_search_query, *args, **kwargs)
+
+    async def handle_onboarding_async(self, *args, **kwargs):
+        return await run_crew(self.handle_onboarding, *args, **kwargs)
+
+    async def handle_weekly_digest_async(self, *args, **kwargs):
+        return await run_crew(self.handle_weekly_digest, *args, **kwargs)
+
+    # Streaming entry points for the SSE endpoints: queue the run and return a
+    # CrewStream of its tokens and steps; raise CrewQueueFull when saturated
+    def stream_student_query(self, *args, **kwargs):
+        return streaming.start(self.process_student_query, *args, **kwargs)
+
+    def stream_club_query(self, *args, **kwargs):
+        return streaming.start(self.handle_club_query, *args, **kwargs)
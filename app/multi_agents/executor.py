@@ -0,0 +1,157 @@
+"""
+Bounded executor for crew runs.
+
+``Crew.kickoff()`` blocks for as long as the LLM calls take, so request
+handlers hand it to this pool instead of running it on the event loop. At
+most CREW_MAX_CONCURRENCY crews run at once; up to CREW_MAX_QUEUE more wait
+for a thread, and anything beyond that is rejected with CrewQueueFull (a 429
+for HTTP clients) rather than piling up. Queue depth, wait and run times are
+reported by stats() (GET /health/crew).
+"""
+import os
+import math
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Recent wait/run times kept for the percentiles in stats()
+SAMPLES = 500
+
+
+class CrewQueueFull(Exception):
+    """Every worker is busy and the queue is at CREW_MAX_QUEUE"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many agent requests in progress, try again shortly")
+        self.retry_after = retry_after
+
+
+def _percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CrewExecutor:
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._counts = Counter()
+        self._waits = deque(maxlen=SAMPLES)
+        self._runs = deque(maxlen=SAMPLES)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: roughly one typical run"""
+        return max(1, math.ceil(_percentile(list(self._runs), 0.5)))
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue ``fn`` for a worker thread; raises CrewQueueFull when the queue is full"""
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._counts["rejected"] += 1
+                raise CrewQueueFull(self.retry_after())
+            self._queued += 1
+            self._counts["submitted"] += 1
+
+        enqueued = time.perf_counter()
+        # Carry the caller's context (profiling, request-scoped vars) into the worker
+        context = contextvars.copy_context()
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._waits.append(started - enqueued)
+            outcome = "failed"
+            try:
+                result = context.run(fn, *args, **kwargs)
+                outcome = "completed"
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._counts[outcome] += 1
+                    self._runs.append(time.perf_counter() - started)
+
+        future = self._pool.submit(call)
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    def _release_cancelled(self, future: Future):
+        # A run cancelled while queued (client gone, shutdown) never reaches
+        # call(), so its queue slot is given back here
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._counts["cancelled"] += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool and await its result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits, runs = list(self._waits), list(self._runs)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._queued,
+                **{name: self._counts[name] for name in ("submitted", "completed", "failed", "cancelled", "rejected")},
+                "wait_ms": {
+                    "p50": round(_percentile(waits, 0.5) * 1000, 1),
+                    "p95": round(_percentile(waits, 0.95) * 1000, 1),
+                    "max": round(max(waits, default=0) * 1000, 1),
+                },
+                "run_ms": {
+                    "p50": round(_percentile(runs, 0.5) * 1000, 1),
+                    "p95": round(_percentile(runs, 0.95) * 1000, 1),
+                },
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> CrewExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = CrewExecutor(
+                    max_workers=int(os.getenv("CREW_MAX_CONCURRENCY", 4)),
+                    max_queue=int(os.getenv("CREW_MAX_QUEUE", 16)),
+                )
+    return _executor
+
+
+async def run_crew(fn, *args, **kwargs):
+    return await get_executor().run(fn, *args, **kwargs)
+
+
+def stats() -> dict:
+    return get_executor().stats()
+
+
+def shutdown():
+    """Drop queued runs; runs already in progress finish in the background"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
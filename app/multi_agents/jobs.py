@@ -0,0 +1,134 @@
+"""
+Background jobs for long-running crew tasks.
+
+submit() queues a crew run on the bounded crew executor and returns a Job
+right away; the HTTP layer hands back its id and clients poll it or follow it
+over SSE. A submission for the same task and student as a job that is still
+queued or running returns that job instead of starting another. Finished
+jobs are kept for JOB_RESULT_TTL seconds. Jobs live in this process's
+memory, so with several workers a client must come back to the same one.
+"""
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Optional
+from .executor import get_executor
+from .registry import get_crew
+
+logger = logging.getLogger(__name__)
+
+# Job task -> ClubEventHubCrew handler taking a student id
+TASKS = {
+    "weekly_digest": "handle_weekly_digest",
+    "onboarding": "handle_onboarding",
+    "recommendations": "handle_recommendation_request",
+}
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class Job:
+    def __init__(self, task: str, student_id: int):
+        self.id = uuid.uuid4().hex
+        self.task = task
+        self.student_id = student_id
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "task": self.task,
+            "student_id": self.student_id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._jobs = {}
+        self._active = {}  # (task, student_id) -> job id while queued or running
+        # Reentrant: a future that is already done runs its callback inside submit()
+        self._lock = threading.RLock()
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job):
+        job.status, job.started_at = RUNNING, time.time()
+        try:
+            job.result = str(getattr(get_crew(), TASKS[job.task])(str(job.student_id)))
+            job.status = SUCCEEDED
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.task} for student {job.student_id}) failed")
+            job.error, job.status = str(e), FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active.pop((job.task, job.student_id), None)
+
+    def _on_done(self, job: Job, future: Future):
+        # Runs dropped from the queue at shutdown never reach _run
+        if future.cancelled() and not job.done:
+            job.error, job.status, job.finished_at = "Cancelled before it started", FAILED, time.time()
+            with self._lock:
+                self._active.pop((job.task, job.student_id), None)
+
+    def submit(self, task: str, student_id: int) -> tuple:
+        """(job, created); raises CrewQueueFull when the crew executor is saturated"""
+        key = (task, student_id)
+        with self._lock:
+            self._purge()
+            active = self._jobs.get(self._active.get(key))
+            if active is not None:
+                return active, False
+            job = Job(task, student_id)
+            # Inside the lock so a concurrent duplicate can't slip in before _active is set
+            job.future = get_executor().submit(self._run, job)
+            job.future.add_done_callback(lambda future: self._on_done(job, future))
+            self._jobs[job.id] = job
+            self._active[key] = job.id
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> JobStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore(ttl=float(os.getenv("JOB_RESULT_TTL", 3600)))
+    return _store
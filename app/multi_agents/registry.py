@@ -0,0 +1,140 @@
+"""
+Process-wide registry of agents and the shared ClubEventHubCrew.
+
+Every router gets the same crew through get_crew(), and the crew asks this
+registry for its agents. An agent is built the first time a request needs
+it, so a worker that only serves chat never builds the recommendation,
+search or onboarding agents. Build times are kept for GET /health/crew.
+
+This module doesn't import crewai: the crew and agent modules are imported
+on first use, or by preload() in the background after startup, so the app
+serves its CRUD routes before the multi-agent stack has loaded.
+"""
+import time
+import asyncio
+import logging
+import threading
+import importlib
+
+logger = logging.getLogger(__name__)
+
+# "module:function" so an agent's module, and crewai with it, load on first build
+BUILDERS = {
+    "master_orchestrator": "multi_agents.agents.master:create_master_orchestrator",
+    "recommendation_agent": "multi_agents.agents.Recommendation:create_recommendation_agent",
+    "search_agent": "multi_agents.agents.search_agent:create_search_agent",
+    "onboarding_agent": "multi_agents.agents.onboarding_agent:create_onboarding_agent",
+}
+CLUB_CHATBOT_BUILDER = "multi_agents.agents.club_chatboot:create_club_chatbot"
+
+
+def _resolve(path: str):
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+class AgentRegistry:
+    def __init__(self, builders: dict):
+        self.builders = builders
+        self._agents = {}
+        self._club_chatbots = {}
+        self._build_seconds = {}
+        self._locks = {name: threading.Lock() for name in builders}
+        self._club_lock = threading.Lock()
+
+    def _build(self, label: str, build):
+        started = time.perf_counter()
+        agent = build()
+        self._build_seconds[label] = time.perf_counter() - started
+        logger.info(f"Built {label} in {self._build_seconds[label] * 1000:.0f}ms")
+        return agent
+
+    def get(self, name: str):
+        """The named agent, built on first use"""
+        agent = self._agents.get(name)
+        if agent is None:
+            with self._locks[name]:
+                agent = self._agents.get(name)
+                if agent is None:
+                    agent = self._agents[name] = self._build(name, _resolve(self.builders[name]))
+        return agent
+
+    def club_chatbot(self, club_id: str, personality: str = "friendly"):
+        """A club's chatbot; the personality of its first request sticks"""
+        agent = self._club_chatbots.get(club_id)
+        if agent is None:
+            with self._club_lock:
+                agent = self._club_chatbots.get(club_id)
+                if agent is None:
+                    agent = self._club_chatbots[club_id] = self._build(
+                        f"club_chatbot:{club_id}", lambda: _resolve(CLUB_CHATBOT_BUILDER)(club_id, personality)
+                    )
+        return agent
+
+    def stats(self) -> dict:
+        club_builds = [seconds for label, seconds in self._build_seconds.items() if label.startswith("club_chatbot:")]
+        return {
+            "agents": {
+                name: {
+                    "built": name in self._agents,
+                    "build_ms": round(self._build_seconds[name] * 1000, 1) if name in self._agents else None,
+                }
+                for name in self.builders
+            },
+            "club_chatbots": {
+                "built": len(self._club_chatbots),
+                "build_ms_total": round(sum(club_builds) * 1000, 1),
+            },
+        }
+
+
+_registry = None
+_crew = None
+# Reentrant: building the crew fetches the registry under the same lock
+_lock = threading.RLock()
+
+
+def get_agents() -> AgentRegistry:
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = AgentRegistry(BUILDERS)
+    return _registry
+
+
+def get_crew():
+    """The ClubEventHubCrew shared by every router"""
+    global _crew
+    if _crew is None:
+        from .crew import ClubEventHubCrew
+
+        with _lock:
+            if _crew is None:
+                _crew = ClubEventHubCrew()
+    return _crew
+
+
+async def get_crew_async():
+    """get_crew() for request handlers; the first call imports crewai, off the event loop"""
+    if _crew is not None:
+        return _crew
+    return await asyncio.to_thread(get_crew)
+
+
+def preload():
+    """Import the crew stack on a background thread so the first agent request doesn't pay for it"""
+    def load():
+        started = time.perf_counter()
+        try:
+            get_crew()
+        except Exception:
+            logger.exception("Preloading the multi-agent stack failed")
+            return
+        logger.info(f"Multi-agent stack loaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    threading.Thread(target=load, name="crew-preload", daemon=True).start()
+
+
+def stats() -> dict:
+    return get_agents().stats()
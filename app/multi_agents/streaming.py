@@ -0,0 +1,156 @@
+"""
+Streaming crew runs for the SSE endpoints.
+
+start() queues a crew run on the bounded crew executor and returns a
+CrewStream right away. The run's agent gets a streaming copy of the LLM and a
+step callback, so its tokens and steps reach the stream as they happen
+instead of after ``kickoff()`` returns. CrewStream.sse() turns them into
+Server-Sent Events: ``status``, ``token``, ``step``, then ``done`` with the
+final answer or ``error``.
+
+When the client goes away the run is cancelled: a queued run never starts,
+and a running one stops at its next step (the LLM call in flight finishes,
+but its tokens are dropped).
+"""
+import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Seconds between SSE comments that keep proxies from closing an idle stream
+KEEPALIVE_SECONDS = 15
+
+# Agent id -> CrewStream of the run that agent copy belongs to
+_runs = {}
+_runs_lock = threading.Lock()
+_handlers_installed = False
+
+
+class RunCancelled(TimeoutError):
+    """The client disconnected. A TimeoutError so crewai stops the agent instead of retrying it"""
+
+
+def _on_chunk(source, event):
+    # crewai emits stream chunks on the thread making the LLM call, so tokens
+    # are forwarded in order
+    stream = _runs.get(event.agent_id)
+    if stream is not None and event.chunk and event.tool_call is None:
+        stream.put("token", {"text": event.chunk})
+
+
+def _install_handlers():
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+    with _runs_lock:
+        if not _handlers_installed:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_chunk)
+            _handlers_installed = True
+
+
+class CrewStream:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue = asyncio.Queue()
+        self.cancelled = threading.Event()
+        self.future: Future = None
+        self._agent_ids = set()
+
+    def put(self, kind: str, data: dict):
+        """Queue an event for the client; safe to call from the crew's worker thread"""
+        if not self.cancelled.is_set():
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, (kind, data))
+
+    def attach(self, agent):
+        """Make a per-run agent copy stream its tokens and steps here"""
+        from .agents.openrouter import get_llm
+
+        agent.llm = get_llm(stream=True)
+        agent.step_callback = self._on_step
+        with _runs_lock:
+            _runs[str(agent.id)] = self
+            self._agent_ids.add(str(agent.id))
+        self.put("status", {"status": "running", "agent": agent.role})
+
+    def _on_step(self, step):
+        if self.cancelled.is_set():
+            raise RunCancelled("Client disconnected")
+        if hasattr(step, "tool"):
+            self.put("step", {
+                "thought": step.thought,
+                "tool": step.tool,
+                "tool_input": step.tool_input,
+                "result": step.result,
+            })
+        else:
+            self.put("step", {"thought": step.thought, "final": True})
+
+    def _detach(self):
+        with _runs_lock:
+            for agent_id in self._agent_ids:
+                _runs.pop(agent_id, None)
+            self._agent_ids.clear()
+
+    def _on_done(self, future: Future):
+        self._detach()
+        if future.cancelled():
+            self.put("error", {"detail": "Cancelled before it started"})
+        elif future.exception() is not None:
+            if not isinstance(future.exception(), RunCancelled):
+                logger.error(f"Streaming crew run failed: {future.exception()}")
+            self.put("error", {"detail": str(future.exception())})
+        else:
+            self.put("done", {"response": str(future.result())})
+
+    def cancel(self):
+        if not self.cancelled.is_set():
+            self.cancelled.set()
+            if self.future is not None:
+                self.future.cancel()
+            self._detach()
+
+    async def sse(self, is_disconnected):
+        """Server-Sent Events for this run; cancels it if the client leaves early"""
+        def event(kind: str, data: dict) -> str:
+            return f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+        yield event("status", {"status": "queued"})
+        idle = 0
+        try:
+            while True:
+                try:
+                    kind, data = await asyncio.wait_for(self.queue.get(), timeout=1)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        return
+                    idle += 1
+                    if idle >= KEEPALIVE_SECONDS:
+                        yield ": keepalive\n\n"
+                        idle = 0
+                    continue
+                idle = 0
+                yield event(kind, data)
+                if kind in ("done", "error"):
+                    return
+        finally:
+            # Reached on a normal finish too, where it is a no-op
+            if not self.future.done():
+                logger.info("Client left a streaming crew run; cancelling it")
+            self.cancel()
+
+
+def start(fn, *args, **kwargs) -> CrewStream:
+    """Queue ``fn(*args, stream=..., **kwargs)`` on the crew executor; raises CrewQueueFull when saturated"""
+    from .executor import get_executor
+
+    _install_handlers()
+    stream = CrewStream(asyncio.get_running_loop())
+    stream.future = get_executor().submit(fn, *args, stream=stream, **kwargs)
+    stream.future.add_done_callback(stream._on_done)
+    return stream
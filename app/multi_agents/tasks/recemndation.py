@@ -50,6 +50,10 @@ def create_weekly_digest_task(agent, student_id: str) -> Task:
         4. Upcoming deadlines
         5. Skills they might want to develop
         
+        Use the get_recommendations_batch database operation with
+        {{"student_ids": [{student_id}], "limit": 5}} for the top events; it reads
+        from a shared precomputed snapshot, so digests for many students stay cheap.
+
         Format as an engaging, personalized newsletter.
 
         IMPORTANT: Return the response as a JSON object with the following structure:
@@ -1,6 +1,29 @@
 from crewai import Task
 
-def create_search_task(agent, search_query: str, filters: dict = None) -> Task:
+def create_search_task(agent, search_query: str, filters: dict = None, parsed: dict = None) -> Task:
+
+    if parsed is not None:
+        return Task(
+            description=f"""Search for events based on the following query:
+        
+        Query: {search_query}
+        
+        The query has already been parsed; do not re-derive dates, synonyms or event types.
+        Search terms: {parsed['search_text'] or 'None'}
+        Filters: {filters if filters else 'None'}
+        Event types mentioned: {', '.join(parsed['event_types']) or 'None'} (already in the search terms; don't add an event_type filter)
+        Skills mentioned: {', '.join(parsed['skills']) or 'None'}
+        
+        Steps:
+        1. Call the search_events database operation once with
+           {{"query": "{parsed['search_text']}", "filters": <the filters above>, "understand": false}}
+        2. Keep the returned order; it is already ranked by relevance
+        3. Highlight trending events or those with limited seats
+        
+        Return results in order of relevance with key details.""",
+            agent=agent,
+            expected_output="Ranked list of relevant events with details"
+        )
 
     return Task(
         description=f"""Search for events based on the following query:
@@ -0,0 +1,257 @@
+"""
+Batch recommendation scoring over sparse matrices.
+
+Loads student×skill, event×skill, student×club, event×club and
+student×event (registered) incidence matrices once, then scores whole blocks
+of students against every upcoming event with two sparse products:
+
+    score = overlap(S·Eᵀ)·25 + same_club(M·Cᵀ)·30 + trending·15 + views·0.05
+
+Weights, exclusions and tie-breaking (score desc, then event id) match the
+SQL scorer in ``databasetool.recommendation_query``, so a student gets the same
+list from either path.
+
+The matrices are a snapshot: they are rebuilt after ``BATCH_SCORER_TTL``
+seconds, or sooner after a write invalidates students, skills, clubs or
+events (which covers memberships and registrations), but no more often than
+every ``BATCH_SCORER_MIN_REBUILD`` seconds, so registration traffic doesn't
+keep it cold. One caller rebuilds while the others keep scoring against the
+previous snapshot. Trending flags and view counts only refresh with the TTL.
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+import cache
+from models import Student, Club, Event, Skill, student_skills, event_skills, event_registrations, club_members
+from .databasetool import SKILL_MATCH_WEIGHT, SAME_CLUB_WEIGHT, TRENDING_WEIGHT, VIEW_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+# Students scored per dense block; memory is roughly CHUNK × events × 8 bytes
+CHUNK_SIZE = int(os.getenv("BATCH_SCORER_CHUNK", 1024))
+
+
+def _positions(sorted_ids: np.ndarray, values: np.ndarray):
+    """Index of each value in sorted_ids, plus a mask of the values that were found"""
+    pos = np.searchsorted(sorted_ids, values)
+    pos = np.minimum(pos, max(len(sorted_ids) - 1, 0))
+    found = sorted_ids[pos] == values if len(sorted_ids) else np.zeros(len(values), dtype=bool)
+    return pos, found
+
+
+def _incidence(pairs: list, row_ids: np.ndarray, col_ids: np.ndarray) -> sparse.csr_matrix:
+    """0/1 CSR matrix from (row id, column id) pairs"""
+    shape = (len(row_ids), len(col_ids))
+    if not pairs:
+        return sparse.csr_matrix(shape, dtype=np.int32)
+    pairs = np.asarray(pairs, dtype=np.int64)
+    rows, row_found = _positions(row_ids, pairs[:, 0])
+    cols, col_found = _positions(col_ids, pairs[:, 1])
+    keep = row_found & col_found
+    data = np.ones(int(keep.sum()), dtype=np.int32)
+    return sparse.csr_matrix((data, (rows[keep], cols[keep])), shape=shape)
+
+
+class RecommendationMatrices:
+    """Sparse snapshot of skills, memberships, registrations and upcoming events"""
+
+    def __init__(self, session: Session, now: datetime = None):
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        upcoming = select(Event.id).where(Event.date > now)
+
+        self.student_ids = np.asarray(
+            session.execute(select(Student.id).order_by(Student.id)).scalars().all(), dtype=np.int64
+        )
+        skills = session.execute(select(Skill.id, Skill.name).order_by(Skill.id)).all()
+        self.skill_ids = np.asarray([s.id for s in skills], dtype=np.int64)
+        self.skill_names = [s.name for s in skills]
+        club_ids = np.asarray(
+            session.execute(select(Club.id).order_by(Club.id)).scalars().all(), dtype=np.int64
+        )
+
+        events = session.execute(
+            select(
+                Event.id, Event.club_id, Event.is_trending, Event.view_count,
+                Event.title, Event.date, Event.location, Club.name.label("club_name"),
+            )
+            .join(Club, Club.id == Event.club_id)
+            .where(Event.date > now)
+            .order_by(Event.id)
+        ).all()
+        self.events = events
+        self.event_ids = np.asarray([e.id for e in events], dtype=np.int64)
+        self.event_dates = [e.date for e in events]
+        # Everything that doesn't depend on the student, kept exact as integers
+        self.event_fixed = np.asarray([TRENDING_WEIGHT if e.is_trending else 0 for e in events], dtype=np.int64)
+        self.event_views = np.asarray([(e.view_count or 0) * VIEW_WEIGHT for e in events], dtype=np.float64)
+
+        self.student_skills = _incidence(
+            session.execute(select(student_skills.c.student_id, student_skills.c.skill_id)).all(),
+            self.student_ids, self.skill_ids
+        )
+        self.event_skills = _incidence(
+            session.execute(
+                select(event_skills.c.event_id, event_skills.c.skill_id)
+                .where(event_skills.c.event_id.in_(upcoming))
+            ).all(),
+            self.event_ids, self.skill_ids
+        )
+        self.student_clubs = _incidence(
+            session.execute(select(club_members.c.student_id, club_members.c.club_id)).all(),
+            self.student_ids, club_ids
+        )
+        self.event_clubs = _incidence(
+            [(e.id, e.club_id) for e in events], self.event_ids, club_ids
+        )
+        self.registrations = _incidence(
+            session.execute(
+                select(event_registrations.c.student_id, event_registrations.c.event_id)
+                .where(event_registrations.c.event_id.in_(upcoming))
+            ).all(),
+            self.student_ids, self.event_ids
+        )
+        self._event_skills_t = self.event_skills.T.tocsr()
+        self._event_clubs_t = self.event_clubs.T.tocsr()
+
+        self.built_at = time.monotonic()
+        logger.info(
+            f"Built recommendation matrices: {len(self.student_ids)} students, "
+            f"{len(self.event_ids)} upcoming events, {len(self.skill_ids)} skills "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def score(self, student_ids=None, limit: int = 15, now: datetime = None) -> dict:
+        """
+        Top ``limit`` recommendations for each student id (all students by
+        default), as {student_id: [recommendation, ...]}. Unknown ids are left out.
+        """
+        if student_ids is None:
+            rows = np.arange(len(self.student_ids))
+        else:
+            rows, found = _positions(self.student_ids, np.asarray(student_ids, dtype=np.int64))
+            rows = rows[found]
+        if len(rows) == 0 or len(self.event_ids) == 0 or limit <= 0:
+            return {int(self.student_ids[r]): [] for r in rows}
+
+        now = now or datetime.utcnow()
+        # The snapshot may be older than some event dates; drop events that have started since
+        expired = np.asarray([date <= now for date in self.event_dates])
+
+        results = {}
+        for start in range(0, len(rows), CHUNK_SIZE):
+            block = rows[start:start + CHUNK_SIZE]
+            overlap = (self.student_skills[block] @ self._event_skills_t).toarray()
+            same_club = (self.student_clubs[block] @ self._event_clubs_t).toarray() > 0
+            fixed = overlap * SKILL_MATCH_WEIGHT + same_club * SAME_CLUB_WEIGHT + self.event_fixed
+            # Rounded like the reported score so float noise can't break a tie out of id order
+            scores = np.round(fixed + self.event_views, 2)
+
+            excluded = self.registrations[block].toarray() > 0
+            excluded |= expired
+            excluded |= scores <= 0
+            scores[excluded] = -np.inf
+
+            for i, row in enumerate(block):
+                results[int(self.student_ids[row])] = self._top(
+                    row, scores[i], overlap[i], same_club[i], limit
+                )
+        return results
+
+    def _top(self, row: int, scores: np.ndarray, overlap: np.ndarray, same_club: np.ndarray, limit: int) -> list:
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if len(candidates) > limit:
+            # Keep every event tied with the k-th best so ties resolve by id, not by partition order
+            kth = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= kth]
+        # Columns are in event id order, so the column index breaks ties by id
+        order = candidates[np.lexsort((candidates, -scores[candidates]))][:limit]
+
+        student_skills = self.student_skills.indices[
+            self.student_skills.indptr[row]:self.student_skills.indptr[row + 1]
+        ]
+        recommendations = []
+        for col in order:
+            event = self.events[col]
+            reasons = []
+            if overlap[col]:
+                event_skills = self.event_skills.indices[
+                    self.event_skills.indptr[col]:self.event_skills.indptr[col + 1]
+                ]
+                names = [self.skill_names[i] for i in np.intersect1d(student_skills, event_skills)]
+                reasons.append(f"Matches your skills: {', '.join(names)}")
+            if same_club[col]:
+                reasons.append("Your club's event")
+            if event.is_trending:
+                reasons.append("Trending event")
+            recommendations.append({
+                "item_id": event.id,
+                "item_type": "event",
+                "title": event.title,
+                "club_name": event.club_name,
+                "date": event.date.isoformat(),
+                "location": event.location,
+                "score": round(float(scores[col]), 2),
+                "reasons": reasons if reasons else ["Popular event"]
+            })
+        return recommendations
+
+
+_matrices = None
+_stale = False
+_build_lock = threading.Lock()
+
+
+# Cache tags whose writes change the matrices; ("trending",) every minute doesn't
+STALE_TAGS = {("students",), ("skills",), ("clubs",), ("events",)}
+
+
+def _mark_stale(tags):
+    global _stale
+    if STALE_TAGS.intersection(tags):
+        _stale = True
+
+
+cache.on_invalidate(_mark_stale)
+
+
+def _due(matrices) -> bool:
+    if matrices is None:
+        return True
+    age = time.monotonic() - matrices.built_at
+    if age > float(os.getenv("BATCH_SCORER_TTL", 300)):
+        return True
+    return _stale and age >= float(os.getenv("BATCH_SCORER_MIN_REBUILD", 60))
+
+
+def get_matrices(session: Session) -> RecommendationMatrices:
+    """The current snapshot, rebuilt when it has expired or the data changed"""
+    global _matrices, _stale
+    matrices = _matrices
+    if not _due(matrices):
+        return matrices
+    # Only the first snapshot is waited for; later rebuilds don't hold up other callers
+    if not _build_lock.acquire(blocking=matrices is None):
+        return matrices
+    try:
+        if _due(_matrices):
+            _stale = False
+            _matrices = RecommendationMatrices(session)
+        return _matrices
+    finally:
+        _build_lock.release()
+
+
+def score_students(session: Session, student_ids=None, limit: int = 15) -> dict:
+    """
+    Top-k recommendations for many students at once; ``student_ids=None``
+    scores every student, for jobs such as the weekly digest (the tool
+    operation caps the list it accepts)
+    """
+    return get_matrices(session).score(student_ids, limit)
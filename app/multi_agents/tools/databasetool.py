@@ -1,13 +1,198 @@
 from crewai.tools import BaseTool
 from typing import Type, Dict, Any
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.orm import Session, selectinload, joinedload, load_only
+from sqlalchemy import and_, or_, desc, func, select, case, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlprofile import profile
+import cache
+import pagination
+from search import similarity, fulltext, trigram, query_understanding
+from workers.trending import record_activity
 from models import (
-    get_session, Student, StudentProfile, Club, Event, Skill
+    get_engine, get_session, mark_replica_down, Student, StudentProfile, Club, Event, Skill,
+    student_skills, event_skills, event_registrations, club_members
 )
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import contextvars
+import threading
 import json
+import os
+
+
+# Operations that never write; these may be served by a read replica
+READ_ONLY_OPERATIONS = {
+    "get_student",
+    "get_club",
+    "get_events",
+    "search_events",
+    "get_recommendations",
+    "get_recommendations_batch",
+    "get_trending_events",
+    "get_club_members",
+    "get_similar_students",
+    "get_all_students",
+    "get_all_clubs",
+    "get_all_skills",
+}
+
+# Maximum statements per operation; over budget logs a warning, or fails in
+# SQL_PROFILE_STRICT mode. Every read loads what its JSON needs up front, so
+# these counts don't depend on how many rows come back.
+QUERY_BUDGETS = {
+    "get_student": 4,
+    "get_club": 4,
+    "get_events": 2,
+    "search_events": 3,  # 1, plus the club and skill trigram indexes when they are (re)built
+    "get_recommendations": 3,
+    "get_recommendations_batch": 8,
+    "get_trending_events": 1,
+    "get_club_members": 2,
+    "get_similar_students": 4,  # 3, plus the MinHash index when it is (re)built
+    "get_all_students": 1,
+    "get_all_clubs": 1,
+    "get_all_skills": 1,
+    "update_profile": 10,
+    "register_event": 5,
+}
+
+# Seconds a read result stays cached; operations not listed are never cached.
+# Writes invalidate through the tags from _cache_tags, so the TTL only bounds
+# staleness from changes made outside this process.
+CACHE_TTLS = {
+    "get_student": 60,
+    "get_club": 300,
+    "get_events": 60,
+    "search_events": 60,
+    "get_trending_events": 60,
+    "get_club_members": 300,
+    "get_all_students": 120,
+    "get_all_clubs": 300,
+    "get_all_skills": 3600,
+}
+
+
+def _cache_tags(operation: str, params: Dict, result: str) -> tuple:
+    """Tags an operation's cached result depends on"""
+    if operation == "get_student":
+        student_id = json.loads(result).get("id")
+        return (("student", student_id), ("students",), ("skills",))
+    if operation == "get_club":
+        club_id = json.loads(result).get("id")
+        return (("club", club_id), ("clubs",))
+    if operation == "get_club_members":
+        return (("club", cache.normalize_params(params.get("club_id"))), ("clubs",), ("students",))
+    if operation in ("get_events", "search_events"):
+        return (("events",), ("clubs",), ("skills",))
+    if operation == "get_trending_events":
+        return (("trending",), ("events",), ("clubs",))
+    if operation == "get_all_students":
+        return (("students",),)
+    if operation == "get_all_clubs":
+        return (("clubs",),)
+    if operation == "get_all_skills":
+        return (("skills",),)
+    return ()
+
+
+# Recommendation weights: per matching skill, same club, trending, per view
+SKILL_MATCH_WEIGHT = 25
+SAME_CLUB_WEIGHT = 30
+TRENDING_WEIGHT = 15
+VIEW_WEIGHT = 0.05
+RECOMMENDATION_LIMIT = 15
+RECOMMENDATION_MAX_LIMIT = 50
+# Students per get_recommendations_batch call; jobs scoring everyone use batch_scorer.score_students
+RECOMMENDATION_BATCH_MAX_STUDENTS = 100
+
+
+def _is_int_id(value) -> bool:
+    """An int, or a string of digits as LLM tool calls often send; bools and floats don't count"""
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit())
+
+
+def _hundredths(weight: float) -> int:
+    return int(round(weight * 100))
+
+
+def _student_skill_ids(student_id):
+    return select(student_skills.c.skill_id).where(student_skills.c.student_id == student_id)
+
+
+def recommendation_query(student_id: int, now: datetime, limit: int):
+    """
+    Score every upcoming event the student hasn't registered for in one
+    aggregate query and return the top ``limit`` rows, best first (ties by id).
+    ``score`` is in hundredths of a point.
+    """
+    overlap = (
+        select(event_skills.c.event_id, func.count().label("skill_overlap"))
+        .where(event_skills.c.skill_id.in_(_student_skill_ids(student_id)))
+        .group_by(event_skills.c.event_id)
+        .subquery()
+    )
+    skill_overlap = func.coalesce(overlap.c.skill_overlap, 0)
+    same_club = case(
+        (Event.club_id.in_(
+            select(club_members.c.club_id).where(club_members.c.student_id == student_id)
+        ), 1),
+        else_=0
+    )
+    trending = case((Event.is_trending == True, 1), else_=0)
+    # In integer hundredths: SQLite sums the weights as floats, and rounding noise
+    # must not reorder events whose rounded scores tie
+    score = (
+        skill_overlap * _hundredths(SKILL_MATCH_WEIGHT)
+        + same_club * _hundredths(SAME_CLUB_WEIGHT)
+        + trending * _hundredths(TRENDING_WEIGHT)
+        + func.coalesce(Event.view_count, 0) * _hundredths(VIEW_WEIGHT)
+    ).label("score")
+    registered = (
+        select(event_registrations.c.event_id)
+        .where(
+            event_registrations.c.student_id == student_id,
+            event_registrations.c.event_id == Event.id,
+        )
+        .exists()
+    )
+    return (
+        select(
+            Event.id, Event.title, Event.date, Event.location, Club.name.label("club_name"),
+            skill_overlap.label("skill_overlap"), same_club.label("same_club"),
+            trending.label("is_trending"), score,
+        )
+        .join(Club, Club.id == Event.club_id)
+        .outerjoin(overlap, overlap.c.event_id == Event.id)
+        .where(Event.date > now, ~registered, score > 0)
+        .order_by(score.desc(), Event.id)
+        .limit(limit)
+    )
+
+
+# Limits for the "batch" operation
+BATCH_MAX_OPERATIONS = int(os.getenv("DB_TOOL_BATCH_MAX_OPERATIONS", 10))
+BATCH_MAX_WORKERS = int(os.getenv("DB_TOOL_BATCH_WORKERS", 4))
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(
+                    max_workers=BATCH_MAX_WORKERS, thread_name_prefix="db-tool-batch"
+                )
+    return _batch_executor
+
+
+# Club columns needed when an event payload shows its club
+_EVENT_CLUB = joinedload(Event.club).load_only(Club.id, Club.name)
 
 
 class DatabaseToolInput(BaseModel):
@@ -27,65 +212,206 @@ class DatabaseTool(BaseTool):
     - get_events: Get events with optional filters
     - search_events: Search events by query and filters
     - get_recommendations: Get personalized recommendations for a student
+    - get_recommendations_batch: Recommendations for many students at once (up to 100), e.g.
+      {"student_ids": [1, 2, 3], "limit": 5}
     - update_profile: Update student profile information
     - register_event: Register a student for an event
     - get_trending_events: Get currently trending events
     - get_club_members: Get members of a specific club
     - get_similar_students: Find students with similar skills
+      ("mode": "minhash" for approximate Jaccard matching on large populations)
+    - get_all_students / get_all_clubs / get_all_skills: One page of the list as
+      {"items": [...], "next_cursor": ...}; pass "cursor" (and optionally "limit")
+      to get the next page
+    - batch: Run several operations in one call and get one combined result, e.g.
+      {"operations": [{"operation": "get_student", "parameters": {"student_id": 1}},
+                      {"operation": "get_trending_events", "parameters": {}}]}
     """
     args_schema: Type[BaseModel] = DatabaseToolInput
 
     def _run(self, operation: str, parameters: Dict[str, Any]) -> str:
         """Execute database operations"""
-        session = get_session()
+        if operation == "batch":
+            with profile("tool:batch"):
+                return self._run_batch(parameters)
+        with profile(f"tool:{operation}", budget=QUERY_BUDGETS.get(operation)):
+            return self._cached(operation, parameters, lambda: self._execute(operation, parameters))
+
+    def _cached(self, operation: str, parameters: Dict[str, Any], compute) -> str:
+        """Serve a cacheable read from the result cache, computing and storing it on a miss"""
+        ttl = CACHE_TTLS.get(operation)
+        if ttl is None or not cache.enabled():
+            return compute()
+        store = cache.get_cache()
+        key = (operation, cache.normalize_params(parameters))
+        result = store.get(key)
+        if result is not cache.MISSING:
+            return result
+        token = store.token()
+        result = compute()
+        if not result.startswith('{"error"'):
+            store.set(key, result, ttl, _cache_tags(operation, parameters, result), token=token)
+        return result
+
+    def _run_batch(self, params: Dict) -> str:
+        """
+        Run a list of {operation, parameters} entries and combine their results.
+
+        Read-only entries before the first write run concurrently, each on its
+        own (replica) session. Everything from the first write onward runs in
+        order on one primary session, so later reads see earlier writes.
+        """
+        entries = params.get('operations')
+        if not isinstance(entries, list) or not entries:
+            return json.dumps({"error": "operations must be a non-empty list"})
+        if len(entries) > BATCH_MAX_OPERATIONS:
+            return json.dumps({"error": f"At most {BATCH_MAX_OPERATIONS} operations per batch"})
+        calls = []
+        for entry in entries:
+            operation = entry.get('operation') if isinstance(entry, dict) else None
+            if not isinstance(operation, str) or operation == "batch":
+                return json.dumps({"error": f"Invalid batch entry: {entry}"})
+            calls.append((operation, entry.get('parameters') or {}))
+
+        first_write = next(
+            (i for i, (operation, _) in enumerate(calls) if operation not in READ_ONLY_OPERATIONS),
+            len(calls)
+        )
+        results = [None] * len(calls)
+
+        # SQLite serializes on one file (or one in-memory connection), so skip the threads
+        concurrent = (
+            first_write > 1
+            and BATCH_MAX_WORKERS > 1
+            and get_engine().dialect.name != "sqlite"
+        )
+        if concurrent:
+            executor = _get_batch_executor()
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._run, operation, parameters)
+                for operation, parameters in calls[:first_write]
+            ]
+            for i, future in enumerate(futures):
+                results[i] = future.result()
+            start = first_write
+        else:
+            start = 0
+
+        if start < len(calls):
+            session = get_session(read_only=first_write == len(calls))
+            try:
+                for i in range(start, len(calls)):
+                    operation, parameters = calls[i]
+                    with profile(f"tool:{operation}", budget=QUERY_BUDGETS.get(operation)):
+                        try:
+                            results[i] = self._cached(
+                                operation, parameters,
+                                lambda: self._dispatch(session, operation, parameters)
+                            )
+                        except OperationalError as e:
+                            if mark_replica_down(session) is None:
+                                session.rollback()
+                                results[i] = json.dumps({"error": str(e)})
+                                continue
+                            # The replica went away mid-batch: retry this entry, and run the rest, on the primary
+                            session.close()
+                            session = get_session()
+                            try:
+                                results[i] = self._cached(
+                                    operation, parameters,
+                                    lambda: self._dispatch(session, operation, parameters)
+                                )
+                            except Exception as e:
+                                session.rollback()
+                                results[i] = json.dumps({"error": str(e)})
+                        except Exception as e:
+                            session.rollback()
+                            results[i] = json.dumps({"error": str(e)})
+            finally:
+                session.close()
+
+        return json.dumps({
+            "results": [
+                {"operation": operation, "result": json.loads(result)}
+                for (operation, _), result in zip(calls, results)
+            ]
+        })
+
+    def _execute(self, operation: str, parameters: Dict[str, Any]) -> str:
+        read_only = operation in READ_ONLY_OPERATIONS
+        session = get_session(read_only=read_only)
         try:
-            if operation == "get_student":
-                return self._get_student(session, parameters)
-            elif operation == "get_club":
-                return self._get_club(session, parameters)
-            elif operation == "get_events":
-                return self._get_events(session, parameters)
-            elif operation == "search_events":
-                return self._search_events(session, parameters)
-            elif operation == "get_recommendations":
-                return self._get_recommendations(session, parameters)
-            elif operation == "update_profile":
-                return self._update_profile(session, parameters)
-            elif operation == "register_event":
-                return self._register_event(session, parameters)
-            elif operation == "get_trending_events":
-                return self._get_trending_events(session, parameters)
-            elif operation == "get_club_members":
-                return self._get_club_members(session, parameters)
-            elif operation == "get_similar_students":
-                return self._get_similar_students(session, parameters)
-            elif operation == "get_all_students":
-                return self._get_all_students(session, parameters)
-            elif operation == "get_all_clubs":
-                return self._get_all_clubs(session, parameters)
-            elif operation == "get_all_skills":
-                return self._get_all_skills(session, parameters)
-            else:
-                return json.dumps({"error": f"Unknown operation: {operation}"})
+            return self._dispatch(session, operation, parameters)
+        except OperationalError as e:
+            # The replica went away mid-call: take it out of rotation and retry on the primary
+            if mark_replica_down(session) is None:
+                return json.dumps({"error": str(e)})
+            session.close()
+            session = get_session()
+            try:
+                return self._dispatch(session, operation, parameters)
+            except Exception as e:
+                return json.dumps({"error": str(e)})
         except Exception as e:
             return json.dumps({"error": str(e)})
         finally:
             session.close()
 
+    def _dispatch(self, session: Session, operation: str, parameters: Dict[str, Any]) -> str:
+        if operation == "get_student":
+            return self._get_student(session, parameters)
+        elif operation == "get_club":
+            return self._get_club(session, parameters)
+        elif operation == "get_events":
+            return self._get_events(session, parameters)
+        elif operation == "search_events":
+            return self._search_events(session, parameters)
+        elif operation == "get_recommendations":
+            return self._get_recommendations(session, parameters)
+        elif operation == "get_recommendations_batch":
+            return self._get_recommendations_batch(session, parameters)
+        elif operation == "update_profile":
+            return self._update_profile(session, parameters)
+        elif operation == "register_event":
+            return self._register_event(session, parameters)
+        elif operation == "get_trending_events":
+            return self._get_trending_events(session, parameters)
+        elif operation == "get_club_members":
+            return self._get_club_members(session, parameters)
+        elif operation == "get_similar_students":
+            return self._get_similar_students(session, parameters)
+        elif operation == "get_all_students":
+            return self._get_all_students(session, parameters)
+        elif operation == "get_all_clubs":
+            return self._get_all_clubs(session, parameters)
+        elif operation == "get_all_skills":
+            return self._get_all_skills(session, parameters)
+        else:
+            return json.dumps({"error": f"Unknown operation: {operation}"})
+
     def _get_student(self, session: Session, params: Dict) -> str:
         """Get student information"""
         student_id = params.get('student_id')
         email = params.get('email')
-        
+
+        query = session.query(Student).options(
+            selectinload(Student.skills),
+            selectinload(Student.clubs).load_only(Club.id, Club.name),
+            joinedload(Student.profile),
+        )
         if student_id:
-            student = session.query(Student).filter(Student.id == student_id).first()
+            student = query.filter(Student.id == student_id).first()
         elif email:
-            student = session.query(Student).filter(Student.email == email).first()
+            student = query.filter(Student.email == email).first()
         else:
             return json.dumps({"error": "Either student_id or email is required"})
         
         if not student:
             return json.dumps({"error": "Student not found"})
+
+        registered_events_count = session.query(func.count()).select_from(event_registrations).filter(
+            event_registrations.c.student_id == student.id
+        ).scalar()
         
         return json.dumps({
             "id": student.id,
@@ -95,7 +421,7 @@ class DatabaseTool(BaseTool):
             "year_level": student.year_level,
             "skills": [{"id": skill.id, "name": skill.name, "category": skill.category} for skill in student.skills],
             "clubs": [{"id": club.id, "name": club.name} for club in student.clubs],
-            "registered_events_count": len(student.registered_events),
+            "registered_events_count": registered_events_count,
             "profile": {
                 "bio": student.profile.bio if student.profile else None,
                 "goals": student.profile.goals if student.profile else None,
@@ -111,12 +437,24 @@ class DatabaseTool(BaseTool):
         if club_id:
             club = session.query(Club).filter(Club.id == club_id).first()
         elif club_name:
-            club = session.query(Club).filter(Club.name.ilike(f"%{club_name}%")).first()
+            # Fuzzy trigram match, so typos like "Robotcs club" still resolve
+            match = trigram.best_match(session, "clubs", club_name)
+            club = session.query(Club).filter(Club.id == match[0]).first() if match else None
         else:
             return json.dumps({"error": "Either club_id or club_name is required"})
         
         if not club:
             return json.dumps({"error": "Club not found"})
+
+        member_count = session.query(func.count()).select_from(club_members).filter(
+            club_members.c.club_id == club.id
+        ).scalar()
+        upcoming_events = session.query(Event).options(
+            load_only(Event.id, Event.title, Event.date, Event.location, Event.event_type)
+        ).filter(
+            Event.club_id == club.id,
+            Event.date > datetime.utcnow()
+        ).order_by(Event.date).limit(10).all()
         
         return json.dumps({
             "id": club.id,
@@ -127,7 +465,7 @@ class DatabaseTool(BaseTool):
             "contact_email": club.contact_email,
             "website": club.website,
             "personality_style": club.personality_style,
-            "member_count": len(club.members),
+            "member_count": member_count,
             "upcoming_events": [
                 {
                     "id": event.id,
@@ -136,8 +474,8 @@ class DatabaseTool(BaseTool):
                     "location": event.location,
                     "event_type": event.event_type
                 }
-                for event in club.events if event.date > datetime.utcnow()
-            ][:10]
+                for event in upcoming_events
+            ]
         })
 
     def _get_events(self, session: Session, params: Dict) -> str:
@@ -163,7 +501,10 @@ class DatabaseTool(BaseTool):
             query = query.filter(Event.date > datetime.utcnow())
         
         limit = params.get('limit', 20)
-        events = query.order_by(Event.date).limit(limit).all()
+        events = query.options(
+            _EVENT_CLUB,
+            selectinload(Event.required_skills).load_only(Skill.name)
+        ).order_by(Event.date).limit(limit).all()
         
         return json.dumps([
             {
@@ -187,24 +528,19 @@ class DatabaseTool(BaseTool):
     def _search_events(self, session: Session, params: Dict) -> str:
         """Search events by query"""
         query_text = params.get('query', '')
-        filters = params.get('filters', {})
+        filters = params.get('filters') or {}
+        
+        # Dates, club, synonyms and skills pulled out of the text without an LLM; event types
+        # only rank. Filters passed explicitly (event_type included) take precedence
+        if query_text and params.get('understand', True):
+            understood = query_understanding.understand(query_text, session)
+            filters = {**understood['filters'], **filters}
+            query_text = understood['search_text']
         
         query = session.query(Event)
         
-        # Text search
-        if query_text:
-            search_terms = query_text.lower().split()
-            conditions = []
-            for term in search_terms:
-                conditions.append(
-                    or_(
-                        Event.title.ilike(f"%{term}%"),
-                        Event.description.ilike(f"%{term}%"),
-                        Event.event_type.ilike(f"%{term}%")
-                    )
-                )
-            if conditions:
-                query = query.filter(or_(*conditions))
+        # Ranked full-text match (tsvector / FTS5, ILIKE where neither is available)
+        query = fulltext.search_events(query, session, query_text)
         
         # Apply filters
         if filters.get('date_from'):
@@ -219,7 +555,7 @@ class DatabaseTool(BaseTool):
         # Only future events
         query = query.filter(Event.date > datetime.utcnow())
         
-        events = query.order_by(desc(Event.is_trending), Event.date).limit(20).all()
+        events = query.options(_EVENT_CLUB).order_by(desc(Event.is_trending), Event.date).limit(20).all()
         
         return json.dumps([
             {
@@ -238,12 +574,12 @@ class DatabaseTool(BaseTool):
 
     def _get_trending_events(self, session: Session, params: Dict) -> str:
         """Get trending events"""
-        trending_events = session.query(Event).filter(
-            and_(
-                Event.date > datetime.utcnow(),
-                Event.is_trending == True
-            )
-        ).order_by(desc(Event.view_count), desc(Event.current_registrations)).limit(10).all()
+        # trending_score is a decayed rolling-window activity score kept by workers/trending.py;
+        # walking its index in order needs no scan of the raw counters
+        trending_events = session.query(Event).options(_EVENT_CLUB).filter(
+            Event.trending_score > 0,
+            Event.date > datetime.utcnow()
+        ).order_by(desc(Event.trending_score), Event.id).limit(10).all()
         
         return json.dumps([
             {
@@ -254,6 +590,7 @@ class DatabaseTool(BaseTool):
                 "seats_remaining": event.seats_available,
                 "registration_count": event.current_registrations,
                 "view_count": event.view_count,
+                "trending_score": event.trending_score,
                 "is_full": event.is_full
             }
             for event in trending_events
@@ -265,61 +602,73 @@ class DatabaseTool(BaseTool):
         if not student_id:
             return json.dumps({"error": "student_id is required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        if not student:
+        if session.execute(select(Student.id).where(Student.id == student_id)).first() is None:
             return json.dumps({"error": "Student not found"})
         
-        student_skill_ids = [s.id for s in student.skills]
-        
-        # Find events matching student skills
-        upcoming_events = session.query(Event).filter(
-            Event.date > datetime.utcnow()
-        ).all()
+        limit = min(int(params.get('limit') or RECOMMENDATION_LIMIT), RECOMMENDATION_MAX_LIMIT)
+        rows = session.execute(recommendation_query(student_id, datetime.utcnow(), limit)).all()
+        if not rows:
+            return json.dumps([])
+        
+        # Names of the matching skills, for the reasons of the events that made the cut
+        matched_skills = {}
+        skill_rows = session.execute(
+            select(event_skills.c.event_id, Skill.name)
+            .join(Skill, Skill.id == event_skills.c.skill_id)
+            .where(
+                event_skills.c.event_id.in_([row.id for row in rows]),
+                event_skills.c.skill_id.in_(_student_skill_ids(student_id)),
+            )
+            .order_by(event_skills.c.event_id, Skill.id)
+        )
+        for event_id, name in skill_rows:
+            matched_skills.setdefault(event_id, []).append(name)
         
         recommendations = []
-        for event in upcoming_events:
-            # Skip if already registered
-            if event in student.registered_events:
-                continue
-            
-            score = 0
+        for row in rows:
             reasons = []
-            
-            # Check skill match
-            event_skill_ids = [s.id for s in event.required_skills]
-            matching_skills = set(student_skill_ids) & set(event_skill_ids)
-            if matching_skills:
-                skill_names = [s.name for s in event.required_skills if s.id in matching_skills]
-                score += len(matching_skills) * 25
-                reasons.append(f"Matches your skills: {', '.join(skill_names)}")
-            
-            # Check if student is in same club
-            if event.club in student.clubs:
-                score += 30
+            if row.skill_overlap:
+                reasons.append(f"Matches your skills: {', '.join(matched_skills.get(row.id, []))}")
+            if row.same_club:
                 reasons.append("Your club's event")
-            
-            # Trending bonus
-            if event.is_trending:
-                score += 15
+            if row.is_trending:
                 reasons.append("Trending event")
-            
-            # Popularity score
-            score += event.view_count * 0.05
-            
-            if score > 0 or len(reasons) > 0:
-                recommendations.append({
-                    "item_id": event.id,
-                    "item_type": "event",
-                    "title": event.title,
-                    "club_name": event.club.name,
-                    "date": event.date.isoformat(),
-                    "location": event.location,
-                    "score": round(score, 2),
-                    "reasons": reasons if reasons else ["Popular event"]
-                })
-        
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return json.dumps(recommendations[:15])
+            recommendations.append({
+                "item_id": row.id,
+                "item_type": "event",
+                "title": row.title,
+                "club_name": row.club_name,
+                "date": row.date.isoformat(),
+                "location": row.location,
+                "score": row.score / 100,
+                "reasons": reasons if reasons else ["Popular event"]
+            })
+        return json.dumps(recommendations)
+
+    def _get_recommendations_batch(self, session: Session, params: Dict) -> str:
+        """Get recommendations for many students from the sparse-matrix scorer"""
+        # numpy/scipy load on first use rather than with the tool
+        from .batch_scorer import score_students
+
+        student_ids = params.get('student_ids')
+        if not isinstance(student_ids, list) or not student_ids:
+            return json.dumps({"error": "student_ids must be a non-empty list"})
+        if len(student_ids) > RECOMMENDATION_BATCH_MAX_STUDENTS:
+            return json.dumps({"error": f"At most {RECOMMENDATION_BATCH_MAX_STUDENTS} student_ids per call"})
+        if not all(_is_int_id(student_id) for student_id in student_ids):
+            return json.dumps({"error": "student_ids must be integers"})
+        student_ids = [int(student_id) for student_id in student_ids]
+        limit = params.get('limit') or RECOMMENDATION_LIMIT
+        if not _is_int_id(limit):
+            return json.dumps({"error": "limit must be an integer"})
+        limit = min(int(limit), RECOMMENDATION_MAX_LIMIT)
+
+        results = score_students(session, student_ids, limit)
+        missing = [student_id for student_id in student_ids if student_id not in results]
+        return json.dumps({
+            "recommendations": {str(student_id): items for student_id, items in results.items()},
+            "missing_students": missing
+        })
 
     def _update_profile(self, session: Session, params: Dict) -> str:
         """Update student profile"""
@@ -343,11 +692,23 @@ class DatabaseTool(BaseTool):
         if 'notification_preferences' in params:
             student.profile.notification_preferences = json.dumps(params['notification_preferences'])
         
-        # Update skills
+        # Update skills; names without an exact match are resolved fuzzily
+        unmatched_skills = []
         if 'skills' in params:
+            names = [name for name in params['skills'] if isinstance(name, str) and name.strip()]
             skills = session.query(Skill).filter(
-                Skill.name.in_(params['skills'])
+                func.lower(Skill.name).in_([name.strip().lower() for name in names])
             ).all()
+            found = {skill.name.lower() for skill in skills}
+            for name in names:
+                if name.strip().lower() in found:
+                    continue
+                match = trigram.best_match(session, "skills", name)
+                if match is None:
+                    unmatched_skills.append(name)
+                elif match[1].lower() not in found:
+                    skills.append(session.get(Skill, match[0]))
+                    found.add(match[1].lower())
             student.skills = skills
         
         # Update basic info
@@ -357,7 +718,11 @@ class DatabaseTool(BaseTool):
             student.year_level = params['year_level']
         
         session.commit()
-        return json.dumps({"success": True, "message": "Profile updated successfully"})
+        cache.invalidate(("student", student.id), ("students",))
+        result = {"success": True, "message": "Profile updated successfully"}
+        if unmatched_skills:
+            result["unmatched_skills"] = unmatched_skills
+        return json.dumps(result)
 
     def _register_event(self, session: Session, params: Dict) -> str:
         """Register student for an event"""
@@ -367,28 +732,44 @@ class DatabaseTool(BaseTool):
         if not student_id or not event_id:
             return json.dumps({"error": "student_id and event_id are required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        event = session.query(Event).filter(Event.id == event_id).first()
-        
-        if not student or not event:
+        event = session.execute(
+            select(Event.id, Event.title, Event.date).where(Event.id == event_id)
+        ).first()
+        student_exists = session.execute(select(Student.id).where(Student.id == student_id)).first()
+        if not student_exists or not event:
             return json.dumps({"error": "Student or event not found"})
         
-        # Check if already registered
-        if event in student.registered_events:
+        now = datetime.utcnow()
+        if event.date < now:
+            return json.dumps({"error": "Cannot register for past events"})
+        
+        # The (student_id, event_id) key rejects a second registration
+        try:
+            session.execute(event_registrations.insert().values(
+                student_id=student_id, event_id=event.id, registered_at=now
+            ))
+        except IntegrityError:
+            session.rollback()
             return json.dumps({"error": "Already registered for this event"})
         
-        # Check if event is full
-        if event.is_full:
+        # Take the seat only if one is left; the row lock serializes concurrent
+        # registrations, and the condition is re-checked against the committed count
+        taken = session.execute(
+            update(Event.__table__)
+            .where(
+                Event.id == event.id,
+                Event.date > now,
+                or_(Event.max_seats.is_(None), Event.current_registrations < Event.max_seats),
+            )
+            .values(current_registrations=Event.current_registrations + 1)
+        ).rowcount
+        if not taken:
+            session.rollback()
             return json.dumps({"error": "Event is full"})
-        
-        # Check if event is in the past
-        if event.is_past:
-            return json.dumps({"error": "Cannot register for past events"})
-        
-        student.registered_events.append(event)
-        event.current_registrations += 1
+        session.execute(record_activity(session.get_bind().dialect.name, event.id, registrations=1))
         
         session.commit()
+        cache.invalidate(("student", int(student_id)), ("events",))
         return json.dumps({
             "success": True,
             "message": f"Successfully registered for {event.title}",
@@ -405,7 +786,12 @@ class DatabaseTool(BaseTool):
         if not club_id:
             return json.dumps({"error": "club_id is required"})
         
-        club = session.query(Club).filter(Club.id == club_id).first()
+        club = session.query(Club).options(
+            load_only(Club.id, Club.name),
+            selectinload(Club.members).load_only(
+                Student.id, Student.name, Student.email, Student.field_of_study, Student.year_level
+            ),
+        ).filter(Club.id == club_id).first()
         if not club:
             return json.dumps({"error": "Club not found"})
         
@@ -429,66 +815,122 @@ class DatabaseTool(BaseTool):
         student_id = params.get('student_id')
         if not student_id:
             return json.dumps({"error": "student_id is required"})
+        mode = params.get('mode') or similarity.default_mode()
+        if mode not in similarity.MODES:
+            return json.dumps({"error": f"mode must be one of {', '.join(similarity.MODES)}"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        if not student:
+        if session.execute(select(Student.id).where(Student.id == student_id)).first() is None:
             return json.dumps({"error": "Student not found"})
         
-        student_skill_ids = {s.id for s in student.skills}
+        limit = min(int(params.get('limit') or 10), 50)
+        if mode == "minhash":
+            # numpy loads on first use rather than with the tool
+            from search.minhash import get_minhash_index
+            matches = get_minhash_index(session).query(int(student_id), limit)
+            students = {
+                row.id: row for row in session.execute(
+                    select(Student.id, Student.name, Student.field_of_study)
+                    .where(Student.id.in_([other_id for other_id, _, _ in matches]))
+                )
+            } if matches else {}
+            rows = [
+                (students[other_id], shared, round(jaccard, 4))
+                for other_id, shared, jaccard in matches if other_id in students
+            ]
+        else:
+            rows = [
+                (row, row.shared, None)
+                for row in session.execute(similarity.similar_students_query(student_id, limit))
+            ]
         
+        common = similarity.common_skill_names(session, student_id, [row.id for row, _, _ in rows])
         similar_students = []
-        for other in session.query(Student).filter(Student.id != student_id).all():
-            other_skill_ids = {s.id for s in other.skills}
-            
-            similarity = len(student_skill_ids & other_skill_ids)
-            
-            if similarity > 0:
-                similar_students.append({
-                    "id": other.id,
-                    "name": other.name,
-                    "field_of_study": other.field_of_study,
-                    "similarity_score": similarity,
-                    "common_skills": [s.name for s in other.skills if s.id in student_skill_ids]
-                })
-        
-        similar_students.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return json.dumps(similar_students[:10])
+        for row, shared, jaccard in rows:
+            similar = {
+                "id": row.id,
+                "name": row.name,
+                "field_of_study": row.field_of_study,
+                "similarity_score": shared,
+                "common_skills": common.get(row.id, [])
+            }
+            if jaccard is not None:
+                similar["jaccard"] = jaccard
+            similar_students.append(similar)
+        return json.dumps(similar_students)
+
+    def _page(self, params: Dict):
+        """(after, limit) from the cursor/limit parameters of a list operation"""
+        return pagination.decode_cursor(params.get('cursor')), pagination.clamp_limit(params.get('limit'))
 
     def _get_all_students(self, session: Session, params: Dict) -> str:
-        """Get all students"""
-        students = session.query(Student).all()
-        return json.dumps([
-            {
-                "id": s.id,
-                "name": s.name,
-                "email": s.email,
-                "field_of_study": s.field_of_study,
-                "year_level": s.year_level
-            }
-            for s in students
-        ])
+        """Get one page of students"""
+        try:
+            after, limit = self._page(params)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        students, next_cursor = pagination.page_of(pagination.keyset(
+            session.query(Student.id, Student.name, Student.email, Student.field_of_study, Student.year_level),
+            Student.id, after, limit
+        ).all(), limit)
+        return json.dumps({
+            "items": [
+                {
+                    "id": s.id,
+                    "name": s.name,
+                    "email": s.email,
+                    "field_of_study": s.field_of_study,
+                    "year_level": s.year_level
+                }
+                for s in students
+            ],
+            "next_cursor": next_cursor
+        })
 
     def _get_all_clubs(self, session: Session, params: Dict) -> str:
-        """Get all clubs"""
-        clubs = session.query(Club).all()
-        return json.dumps([
-            {
-                "id": c.id,
-                "name": c.name,
-                "description": c.description,
-                "member_count": len(c.members)
-            }
-            for c in clubs
-        ])
+        """Get one page of clubs"""
+        try:
+            after, limit = self._page(params)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        clubs, next_cursor = pagination.page_of(pagination.keyset(
+            session.query(
+                Club.id, Club.name, Club.description,
+                func.count(club_members.c.student_id).label("member_count")
+            ).outerjoin(club_members, club_members.c.club_id == Club.id).group_by(
+                Club.id, Club.name, Club.description
+            ),
+            Club.id, after, limit
+        ).all(), limit)
+        return json.dumps({
+            "items": [
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "description": c.description,
+                    "member_count": c.member_count
+                }
+                for c in clubs
+            ],
+            "next_cursor": next_cursor
+        })
 
     def _get_all_skills(self, session: Session, params: Dict) -> str:
-        """Get all skills"""
-        skills = session.query(Skill).all()
-        return json.dumps([
-            {
-                "id": s.id,
-                "name": s.name,
-                "category": s.category
-            }
-            for s in skills
-        ])
\ No newline at end of file
+        """Get one page of skills"""
+        try:
+            after, limit = self._page(params)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        skills, next_cursor = pagination.page_of(pagination.keyset(
+            session.query(Skill.id, Skill.name, Skill.category), Skill.id, after, limit
+        ).all(), limit)
+        return json.dumps({
+            "items": [
+                {
+                    "id": s.id,
+                    "name": s.name,
+                    "category": s.category
+                }
+                for s in skills
+            ],
+            "next_cursor": next_cursor
+        })
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Keyset pagination for list endpoints and DatabaseTool list operations.
+
+Pages are ordered by primary key and continue after the last id of the previous
+page, carried in an opaque cursor. Each page is one indexed range scan of
+``limit + 1`` rows (the extra row tells whether another page follows), so the
+cost of a page doesn't grow with the table or with how deep the client is.
+Page sizes default to PAGE_SIZE_DEFAULT and are capped at PAGE_SIZE_MAX.
+
+HTTP endpoints keep returning a plain list and put the next cursor in the
+``X-Next-Cursor`` header; it is absent on the last page.
+"""
+import os
+import json
+import base64
+from typing import NamedTuple, Optional
+from fastapi import HTTPException, Query, Response, status
+
+DEFAULT_LIMIT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+MAX_LIMIT = int(os.getenv("PAGE_SIZE_MAX", 200))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple):
+    after: Optional[int]
+    limit: int
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"after": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor) -> Optional[int]:
+    """Last id of the previous page, or None for the first page; ValueError if malformed"""
+    if cursor in (None, ""):
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(raw)["after"]
+    except (TypeError, ValueError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(after, int) or isinstance(after, bool):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+def clamp_limit(limit) -> int:
+    """Page size from a caller-supplied value, bounded to 1..MAX_LIMIT"""
+    if limit is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def keyset(stmt, column, after: Optional[int], limit: int):
+    """Restrict a select (or ORM query) to the page after ``after``, ordered by ``column``"""
+    if after is not None:
+        stmt = stmt.where(column > after)
+    return stmt.order_by(column).limit(limit + 1)
+
+
+def page_of(rows, limit: int, key=lambda row: row.id) -> tuple:
+    """(rows on this page, next cursor or None) from the ``limit + 1`` rows keyset() fetched"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+) -> Page:
+    """FastAPI dependency reading ``cursor`` and ``limit`` query parameters"""
+    try:
+        return Page(decode_cursor(cursor), limit)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,104 @@
+"""
+Ranked full-text search over events.
+
+Backends, picked from the session's dialect:
+
+- ``postgresql``: ``events.search_vector @@ to_tsquery(...)`` served by the
+  GIN index from migration 0003, ranked with ``ts_rank``.
+- ``sqlite``: ``events_fts MATCH ...`` on the FTS5 table from migration 0003,
+  ranked with ``bm25``.
+- ``ilike``: the old substring match, for SQLite builds without FTS5 and
+  other databases. Unranked.
+
+Query words are OR-ed and prefix-matched ("hack" finds "hackathon"), close to
+what the old ILIKE search matched, but now ordered by relevance.
+"""
+import re
+import sqlite3
+from functools import lru_cache
+from sqlalchemy import Float, Integer, func, literal_column, or_, text
+from sqlalchemy.orm import Query, Session
+from models import Event
+
+MAX_TERMS = 16
+
+# Letters and digits only; keeps tsquery and FTS5 syntax characters out of the match
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# bm25 column weights, in events_fts column order: title, description, event_type
+_BM25_WEIGHTS = "10.0, 1.0, 5.0"
+
+
+@lru_cache(maxsize=1)
+def fts5_available() -> bool:
+    """Whether the linked SQLite library was built with FTS5"""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(body)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def backend(session: Session) -> str:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return "postgresql"
+    if dialect == "sqlite" and fts5_available():
+        return "sqlite"
+    return "ilike"
+
+
+def terms(query_text: str) -> list:
+    """Distinct lower-cased words of a query, in order"""
+    seen = []
+    for term in _TERM_RE.findall((query_text or "").lower()):
+        if term not in seen:
+            seen.append(term)
+    return seen[:MAX_TERMS]
+
+
+def search_events(query: Query, session: Session, query_text: str) -> Query:
+    """
+    Restrict an ``Event`` query to events matching ``query_text`` and order it
+    by relevance, best first. Callers add their tie-breaking order after this.
+    """
+    words = terms(query_text)
+    if not words:
+        return query
+
+    engine = backend(session)
+    if engine == "postgresql":
+        vector = literal_column("events.search_vector")
+        tsquery = func.to_tsquery("english", " | ".join(f"{word}:*" for word in words))
+        return query.filter(vector.op("@@")(tsquery)).order_by(func.ts_rank(vector, tsquery).desc())
+
+    if engine == "sqlite":
+        matches = text(
+            f"SELECT rowid AS event_id, bm25(events_fts, {_BM25_WEIGHTS}) AS rank "
+            f"FROM events_fts WHERE events_fts MATCH :match"
+        ).bindparams(
+            match=" OR ".join(f'"{word}"*' for word in words)
+        ).columns(event_id=Integer, rank=Float).subquery("fts")
+        # bm25 is lower-is-better
+        return query.join(matches, matches.c.event_id == Event.id).order_by(matches.c.rank)
+
+    return query.filter(or_(*(
+        or_(
+            Event.title.ilike(f"%{word}%"),
+            Event.description.ilike(f"%{word}%"),
+            Event.event_type.ilike(f"%{word}%")
+        )
+        for word in words
+    )))
+
+
+def drop_sqlite_index(conn):
+    """Remove the FTS5 table and triggers, e.g. before the schema is rebuilt"""
+    if conn.dialect.name != "sqlite":
+        return
+    for trigger in ("events_fts_insert", "events_fts_delete", "events_fts_update"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text("DROP TABLE IF EXISTS events_fts"))
@@ -0,0 +1,195 @@
+"""
+MinHash/LSH index over student skill sets.
+
+Each student's skill set is reduced to a MinHash signature and split into LSH
+bands. Only students who collide with the query in at least one band become
+candidates, and those are ranked by exact Jaccard with a bounded heap. It is
+approximate: a student with low Jaccard similarity can be missed.
+
+Profile and student writes re-hash only the students they touched: their new
+signatures sit in a small overlay next to the bulk index until the next full
+rebuild, which happens after ``SIMILARITY_INDEX_TTL`` seconds or when the
+skill catalogue itself changes.
+"""
+import os
+import time
+import heapq
+import logging
+import threading
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+import cache
+from models import student_skills
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family h(x) = (a*x + b) mod p
+_PRIME = (1 << 31) - 1
+
+
+class MinHashIndex:
+    """MinHash signatures of every student's skill set, bucketed into LSH bands"""
+
+    def __init__(self, session: Session, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        started = time.perf_counter()
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+
+        pairs = np.asarray(
+            session.execute(
+                select(student_skills.c.student_id, student_skills.c.skill_id)
+                .order_by(student_skills.c.student_id)
+            ).all(),
+            dtype=np.int64
+        ).reshape(-1, 2)
+        self.student_ids, starts = np.unique(pairs[:, 0], return_index=True)
+        skills = pairs[:, 1]
+        # Skill sets as CSR-style slices: skills[indptr[i]:indptr[i + 1]]
+        self.skills = skills
+        self.indptr = np.append(starts, len(skills))
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+        if len(skills):
+            hashed = (skills[:, None] * self.a[None, :] + self.b[None, :]) % _PRIME
+            signatures = np.minimum.reduceat(hashed, starts, axis=0)
+        else:
+            signatures = np.empty((0, num_perm), dtype=np.int64)
+
+        # One 64-bit key per (student, band); sorted per band so a bucket is a searchsorted range
+        self.mix = rng.integers(1, 1 << 61, size=self.rows_per_band, dtype=np.int64)
+        banded = signatures.reshape(len(self.student_ids), bands, self.rows_per_band)
+        self.band_keys = (banded * self.mix).sum(axis=2)
+        self.band_order = np.argsort(self.band_keys, axis=0, kind="stable")
+        self.band_sorted = np.take_along_axis(self.band_keys, self.band_order, axis=0)
+
+        # Students re-hashed since the build: (id -> (skill set, band keys),
+        # ids and keys of those with skills), swapped whole so queries see one version
+        self._overlay = ({}, np.empty(0, dtype=np.int64), np.empty((0, bands), dtype=np.int64))
+
+        self.built_at = time.monotonic()
+        logger.info(
+            f"Built MinHash index: {len(self.student_ids)} students, {num_perm} permutations, "
+            f"{bands} bands in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _skill_set(self, row: int) -> set:
+        return set(self.skills[self.indptr[row]:self.indptr[row + 1]].tolist())
+
+    def _band_keys(self, skills: set) -> np.ndarray:
+        """Band keys of one skill set, hashed exactly as in the bulk build"""
+        skills = np.fromiter(skills, dtype=np.int64, count=len(skills))
+        signature = ((skills[:, None] * self.a[None, :] + self.b[None, :]) % _PRIME).min(axis=0)
+        return (signature.reshape(self.bands, self.rows_per_band) * self.mix).sum(axis=1)
+
+    def update(self, session: Session, student_ids) -> None:
+        """Re-read and re-hash the skill sets of ``student_ids``; deleted or skill-less students drop out"""
+        skill_sets = {int(student_id): set() for student_id in student_ids}
+        for student_id, skill_id in session.execute(
+            select(student_skills.c.student_id, student_skills.c.skill_id)
+            .where(student_skills.c.student_id.in_(list(skill_sets)))
+        ):
+            skill_sets[student_id].add(skill_id)
+
+        entries = dict(self._overlay[0])
+        for student_id, skills in skill_sets.items():
+            entries[student_id] = (skills, self._band_keys(skills) if skills else None)
+        hashed = [(student_id, keys) for student_id, (_, keys) in entries.items() if keys is not None]
+        self._overlay = (
+            entries,
+            np.asarray([student_id for student_id, _ in hashed], dtype=np.int64),
+            np.vstack([keys for _, keys in hashed]) if hashed else np.empty((0, self.bands), dtype=np.int64),
+        )
+
+    def query(self, student_id: int, limit: int = 10) -> list:
+        """[(student id, shared skills, jaccard)] for the most similar LSH candidates"""
+        overlay, overlay_ids, overlay_keys = self._overlay
+        if student_id in overlay:
+            mine, keys = overlay[student_id]
+            if not mine:
+                return []
+        else:
+            row = np.searchsorted(self.student_ids, student_id)
+            if row >= len(self.student_ids) or self.student_ids[row] != student_id:
+                return []
+            mine, keys = self._skill_set(row), self.band_keys[row]
+
+        rows = []
+        for band in range(self.bands):
+            lo = np.searchsorted(self.band_sorted[:, band], keys[band], side="left")
+            hi = np.searchsorted(self.band_sorted[:, band], keys[band], side="right")
+            rows.append(self.band_order[lo:hi, band])
+        # Students in the overlay are matched on their new keys, not their bulk rows
+        candidates = {
+            int(self.student_ids[other]): other for other in np.unique(np.concatenate(rows)).tolist()
+            if int(self.student_ids[other]) not in overlay
+        }
+        for other_id in overlay_ids[(overlay_keys == keys).any(axis=1)].tolist():
+            candidates[other_id] = None
+        candidates.pop(student_id, None)
+
+        scored = []
+        for other_id, other in candidates.items():
+            theirs = overlay[other_id][0] if other is None else self._skill_set(other)
+            shared = len(mine & theirs)
+            if shared:
+                jaccard = shared / len(mine | theirs)
+                scored.append((jaccard, shared, -other_id))
+        best = heapq.nlargest(limit, scored)
+        return [(-negated_id, shared, jaccard) for jaccard, shared, negated_id in best]
+
+
+_index = None
+_stale = False
+_index_lock = threading.Lock()
+# Students whose skills may have changed since the index last looked at them
+_dirty = set()
+_dirty_lock = threading.Lock()
+
+
+def _mark_stale(tags):
+    global _stale
+    if ("skills",) in tags:
+        _stale = True
+    elif ("students",) in tags:
+        # Profile edits and deletes name the student; a signup doesn't, but has no skills yet
+        with _dirty_lock:
+            _dirty.update(tag[1] for tag in tags if len(tag) == 2 and tag[0] == "student")
+
+
+cache.on_invalidate(_mark_stale)
+
+
+def _take_dirty() -> set:
+    global _dirty
+    with _dirty_lock:
+        dirty, _dirty = _dirty, set()
+    return dirty
+
+
+def get_minhash_index(session: Session) -> MinHashIndex:
+    """
+    Shared index, rebuilt after SIMILARITY_INDEX_TTL seconds or when the skill
+    catalogue changes; students whose skills changed are re-hashed in place
+    """
+    global _index, _stale
+    ttl = float(os.getenv("SIMILARITY_INDEX_TTL", 600))
+    with _index_lock:
+        if _index is None or _stale or time.monotonic() - _index.built_at > ttl:
+            _stale = False
+            # Taken before the build reads the table, so later writes are applied next time
+            _take_dirty()
+            _index = MinHashIndex(
+                session,
+                num_perm=int(os.getenv("SIMILARITY_MINHASH_PERMUTATIONS", 64)),
+                bands=int(os.getenv("SIMILARITY_MINHASH_BANDS", 16)),
+            )
+        else:
+            dirty = _take_dirty()
+            if dirty:
+                _index.update(session, dirty)
+        return _index
@@ -0,0 +1,220 @@
+"""
+Deterministic query understanding for event search.
+
+Turns a free-text query such as "coding hackathons this weekend by the
+robotics club" into search terms and structured filters, without an LLM call:
+
+- date phrases ("today", "this weekend", "next week", "friday",
+  "in 3 days", "2025-05-01") become ``date_from`` / ``date_to``;
+- "... club" phrases resolve to a club through the trigram index
+  (``club_id``);
+- event-type words and their variants ("contest", "lecture") are kept as
+  search terms along with their canonical type, and listed in
+  ``event_types``. They rank rather than filter: ``events.event_type`` is
+  free text, so an exact filter on the canonical name misses "Workshop" or
+  "conference";
+- synonyms from ``synonyms.json`` add their canonical term
+  ("coding" -> "programming");
+- remaining words are normalized against the Skill table.
+
+The dictionary lives in ``search/synonyms.json`` (or ``SYNONYMS_PATH``).
+"""
+import os
+import re
+import json
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from sqlalchemy.orm import Session
+from . import trigram
+
+DEFAULT_SYNONYMS_PATH = Path(__file__).parent / "synonyms.json"
+
+# A skill must match a query word this closely to count as that skill
+SKILL_MATCH_THRESHOLD = 0.8
+MAX_PHRASE_WORDS = 3
+
+_WEEKDAYS = {name.lower(): i for i, name in enumerate(calendar.day_name)}
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+_CLUB_RE = re.compile(
+    r"\b(?:(?:hosted|organi[sz]ed|run)\s+by|by|from|with)\s+(?:the\s+)?"
+    r"((?:[a-z0-9&'\-]+\s+){0,3}?[a-z0-9&'\-]+\s+club)\b"
+    r"|\b((?:[a-z0-9&'\-]+\s+){0,2}?[a-z0-9&'\-]+\s+club)\b"
+)
+
+
+@lru_cache(maxsize=1)
+def load_dictionary() -> dict:
+    """Stopwords, event-type variants and synonyms, indexed by variant"""
+    path = Path(os.getenv("SYNONYMS_PATH") or DEFAULT_SYNONYMS_PATH)
+    data = json.loads(path.read_text())
+    event_types, synonyms = {}, {}
+    for canonical, variants in data.get("event_types", {}).items():
+        for variant in [canonical, *variants]:
+            event_types[variant.lower()] = canonical
+    for canonical, variants in data.get("synonyms", {}).items():
+        for variant in [canonical, *variants]:
+            synonyms[variant.lower()] = canonical
+    return {
+        "stopwords": {word.lower() for word in data.get("stopwords", [])},
+        "event_types": event_types,
+        "synonyms": synonyms,
+    }
+
+
+def _day_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_range(day: datetime) -> tuple:
+    start = _day_start(day)
+    return start, start + timedelta(days=1) - timedelta(microseconds=1)
+
+
+def _month_range(year: int, month: int) -> tuple:
+    start = datetime(year, month, 1)
+    last = calendar.monthrange(year, month)[1]
+    return start, datetime(year, month, last, 23, 59, 59, 999999)
+
+
+def _date_patterns(now: datetime) -> list:
+    """(regex, match -> (start, end)) in priority order"""
+    today = _day_start(now)
+    week_start = today - timedelta(days=today.weekday())
+
+    def weekend(offset_weeks):
+        saturday = week_start + timedelta(days=5 + 7 * offset_weeks)
+        return saturday, saturday + timedelta(days=2) - timedelta(microseconds=1)
+
+    def next_month():
+        year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+        return _month_range(year, month)
+
+    def weekday(match):
+        qualifier, name = match.group(1), match.group(2)
+        ahead = (_WEEKDAYS[name] - today.weekday()) % 7
+        if qualifier == "next" and ahead == 0:
+            ahead = 7
+        return _day_range(today + timedelta(days=ahead))
+
+    def explicit(match):
+        try:
+            return _day_range(datetime.strptime(match.group(1), "%Y-%m-%d"))
+        except ValueError:
+            return None
+
+    return [
+        (r"\b(\d{4}-\d{2}-\d{2})\b", explicit),
+        (r"\b(?:today|tonight)\b", lambda m: _day_range(today)),
+        (r"\btomorrow\b", lambda m: _day_range(today + timedelta(days=1))),
+        (r"\bnext\s+weekend\b", lambda m: weekend(1)),
+        (r"\b(?:this\s+)?weekend\b", lambda m: weekend(0)),
+        (r"\bthis\s+week\b", lambda m: (now, week_start + timedelta(days=7) - timedelta(microseconds=1))),
+        (r"\bnext\s+week\b", lambda m: (
+            week_start + timedelta(days=7), week_start + timedelta(days=14) - timedelta(microseconds=1)
+        )),
+        (r"\bthis\s+month\b", lambda m: (now, _month_range(now.year, now.month)[1])),
+        (r"\bnext\s+month\b", lambda m: next_month()),
+        (r"\b(?:in|within|next)\s+(\d{1,3})\s+days?\b", lambda m: (now, now + timedelta(days=int(m.group(1))))),
+        (r"\b(?:(this|next|on)\s+)?(" + "|".join(_WEEKDAYS) + r")s?\b", weekday),
+    ]
+
+
+def _extract_dates(text: str, now: datetime):
+    for pattern, resolve in _date_patterns(now):
+        match = re.search(pattern, text)
+        if match:
+            span = resolve(match)
+            if span:
+                text = text[:match.start()] + " " + text[match.end():]
+                return text, span, match.group(0)
+    return text, None, None
+
+
+def _extract_club(text: str, session: Session):
+    for match in _CLUB_RE.finditer(text):
+        phrase = (match.group(1) or match.group(2)).strip()
+        found = trigram.get_index(session, "clubs").best(phrase, trigram.threshold())
+        if found:
+            text = text[:match.start()] + " " + text[match.end():]
+            return text, found
+    return text, None
+
+
+def _phrases(words: list) -> list:
+    """Greedy longest-first split of words into dictionary phrases and single words"""
+    dictionary = load_dictionary()
+    known = dictionary["event_types"].keys() | dictionary["synonyms"].keys()
+    phrases, i = [], 0
+    while i < len(words):
+        for size in range(min(MAX_PHRASE_WORDS, len(words) - i), 0, -1):
+            candidate = " ".join(words[i:i + size])
+            if size == 1 or candidate in known:
+                phrases.append(candidate)
+                i += size
+                break
+    return phrases
+
+
+def understand(query_text: str, session: Session = None, now: datetime = None) -> dict:
+    """
+    Parse a search query into ``terms`` (for full-text search), ``filters``
+    (date_from/date_to/club_id as DatabaseTool expects them), the canonical
+    ``event_types`` and the normalized ``skills`` it mentions. Club and skill
+    resolution need a session.
+    """
+    now = now or datetime.utcnow()
+    dictionary = load_dictionary()
+    text = " ".join((query_text or "").lower().split())
+    filters, matched = {}, {}
+
+    text, span, phrase = _extract_dates(text, now)
+    if span:
+        filters["date_from"], filters["date_to"] = span[0].isoformat(), span[1].isoformat()
+        matched["dates"] = phrase
+
+    if session is not None:
+        text, club = _extract_club(text, session)
+        if club:
+            filters["club_id"] = club[0]
+            matched["club"] = club[1]
+
+    terms, event_types, skills = [], [], []
+
+    def add(term):
+        if term not in terms:
+            terms.append(term)
+
+    for phrase in _phrases(_WORD_RE.findall(text)):
+        phrase = phrase.strip(".-")
+        if len(phrase) < 2 or phrase in dictionary["stopwords"]:
+            continue
+        if phrase in dictionary["event_types"]:
+            event_type = dictionary["event_types"][phrase]
+            if event_type not in event_types:
+                event_types.append(event_type)
+            add(phrase)
+            add(event_type)
+            continue
+        add(phrase)
+        canonical = dictionary["synonyms"].get(phrase)
+        if canonical:
+            add(canonical)
+        if session is not None:
+            skill = trigram.get_index(session, "skills").best(canonical or phrase, SKILL_MATCH_THRESHOLD)
+            if skill and skill[1] not in skills:
+                skills.append(skill[1])
+
+    for skill in skills:
+        add(skill.lower())
+
+    return {
+        "query": query_text,
+        "terms": terms,
+        "search_text": " ".join(terms),
+        "filters": filters,
+        "event_types": event_types,
+        "skills": skills,
+        "matched": matched,
+    }
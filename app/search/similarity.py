@@ -0,0 +1,60 @@
+"""
+Similar-student search.
+
+``exact`` mode counts shared skills with a self-join on ``student_skills``.
+The join starts from the student's own skills and goes through the
+``skill_id`` index, so it only touches students who share at least one
+skill. The database keeps the top ``limit`` by (shared skills desc, id).
+
+``minhash`` mode (``search.minhash``) answers in sublinear time on very
+large populations, at the cost of being approximate.
+"""
+import os
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from models import Student, Skill, student_skills
+
+MODES = ("exact", "minhash")
+
+
+def default_mode() -> str:
+    mode = os.getenv("SIMILARITY_MODE", "exact").lower()
+    return mode if mode in MODES else "exact"
+
+
+def _skill_ids(student_id):
+    return select(student_skills.c.skill_id).where(student_skills.c.student_id == student_id)
+
+
+def similar_students_query(student_id: int, limit: int):
+    """Students sharing the most skills with ``student_id``, best first"""
+    other = student_skills.alias("other")
+    shared = func.count().label("shared")
+    return (
+        select(Student.id, Student.name, Student.field_of_study, shared)
+        .select_from(other)
+        .join(Student, Student.id == other.c.student_id)
+        .where(other.c.skill_id.in_(_skill_ids(student_id)), other.c.student_id != student_id)
+        .group_by(Student.id, Student.name, Student.field_of_study)
+        .order_by(shared.desc(), Student.id)
+        .limit(limit)
+    )
+
+
+def common_skill_names(session: Session, student_id: int, other_ids: list) -> dict:
+    """{other student id: [names of skills shared with student_id]}, ordered by skill id"""
+    if not other_ids:
+        return {}
+    rows = session.execute(
+        select(student_skills.c.student_id, Skill.name)
+        .join(Skill, Skill.id == student_skills.c.skill_id)
+        .where(
+            student_skills.c.student_id.in_(other_ids),
+            student_skills.c.skill_id.in_(_skill_ids(student_id)),
+        )
+        .order_by(student_skills.c.student_id, Skill.id)
+    )
+    names = {}
+    for other_id, name in rows:
+        names.setdefault(other_id, []).append(name)
+    return names
@@ -0,0 +1,155 @@
+"""
+Fuzzy name lookup for clubs and skills.
+
+Names are compared by trigrams, the way pg_trgm does: lower-cased words padded
+with two spaces in front and one behind. The score is pg_trgm's
+``word_similarity``: how much of the query is found in the name. "Robotcs club"
+therefore still finds "Robotics Club".
+
+On Postgres with pg_trgm (migration 0004) the lookup is one query using
+``lower(name) %> query`` and the GIN index on lower(name). Otherwise an in-memory
+trigram index is built per table on first use and dropped when the cache
+invalidates clubs or skills.
+"""
+import os
+import re
+import time
+import logging
+import threading
+from collections import Counter
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+import cache
+from models import Club, Skill
+
+logger = logging.getLogger(__name__)
+
+# Lookups below this score return nothing. pg_trgm's own
+# word_similarity_threshold (0.6 by default) also applies to the indexed query.
+DEFAULT_THRESHOLD = 0.6
+
+MODELS = {
+    "clubs": Club,
+    "skills": Skill,
+}
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def threshold() -> float:
+    return float(os.getenv("TRIGRAM_THRESHOLD", DEFAULT_THRESHOLD))
+
+
+def trigrams(value: str) -> set:
+    grams = set()
+    for word in _WORD_RE.findall((value or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Posting lists from trigram to the rows whose name contains it"""
+
+    def __init__(self, rows):
+        started = time.perf_counter()
+        self.names = {}
+        self.grams = {}
+        self.postings = {}
+        for row_id, name in rows:
+            grams = trigrams(name)
+            self.names[row_id] = name
+            self.grams[row_id] = grams
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(row_id)
+        self.elapsed = time.perf_counter() - started
+
+    def best(self, query: str, min_score: float):
+        """(id, name, score) of the best match, or None"""
+        wanted = trigrams(query)
+        if not wanted:
+            return None
+        shared = Counter()
+        for gram in wanted:
+            shared.update(self.postings.get(gram, ()))
+        best = None
+        for row_id, count in shared.items():
+            score = count / len(wanted)
+            if score < min_score:
+                continue
+            # Prefer the better word match, then the closer whole-name match, then the lower id
+            similarity = count / len(wanted | self.grams[row_id])
+            key = (score, similarity, -row_id)
+            if best is None or key > best[0]:
+                best = (key, row_id)
+        if best is None:
+            return None
+        (score, _, _), row_id = best
+        return row_id, self.names[row_id], round(score, 4)
+
+
+_indexes = {}
+_pg_trgm = {}
+_lock = threading.Lock()
+
+
+def _invalidate(tags):
+    for tag in tags:
+        if tag[0] in ("clubs", "club"):
+            _indexes.pop("clubs", None)
+        elif tag[0] == "skills":
+            _indexes.pop("skills", None)
+
+
+cache.on_invalidate(_invalidate)
+
+
+def _has_pg_trgm(session: Session) -> bool:
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    key = bind.url.render_as_string(hide_password=True)
+    if key not in _pg_trgm:
+        _pg_trgm[key] = session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+    return _pg_trgm[key]
+
+
+def get_index(session: Session, kind: str) -> TrigramIndex:
+    index = _indexes.get(kind)
+    if index is None:
+        with _lock:
+            index = _indexes.get(kind)
+            if index is None:
+                model = MODELS[kind]
+                index = TrigramIndex(session.execute(select(model.id, model.name)).all())
+                logger.info(f"Built trigram index for {kind}: {len(index.names)} names in {index.elapsed:.3f}s")
+                _indexes[kind] = index
+    return index
+
+
+def best_match(session: Session, kind: str, name: str, min_score: float = None):
+    """
+    Best fuzzy match for ``name`` among ``kind`` ("clubs" or "skills") as
+    (id, name, score), or None when nothing scores at least ``min_score``.
+    """
+    min_score = threshold() if min_score is None else min_score
+    query = (name or "").strip().lower()
+    if not query:
+        return None
+    if not _has_pg_trgm(session):
+        return get_index(session, kind).best(query, min_score)
+
+    model = MODELS[kind]
+    lowered = func.lower(model.name)
+    score = func.word_similarity(query, lowered).label("score")
+    row = session.execute(
+        select(model.id, model.name, score)
+        .where(lowered.op("%>")(query))
+        .order_by(score.desc(), func.similarity(query, lowered).desc(), model.id)
+        .limit(1)
+    ).first()
+    if row is None or row.score < min_score:
+        return None
+    return row.id, row.name, round(float(row.score), 4)
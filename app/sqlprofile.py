@@ -0,0 +1,163 @@
+"""
+Request-scoped SQL profiling built on SQLAlchemy engine events.
+
+Every statement executed inside a ``profile()`` block is counted and timed.
+Repeated statements of the same shape are flagged as likely N+1 queries.
+Blocks can nest (a DatabaseTool operation inside an HTTP request), and each
+active block records the statement.
+"""
+import os
+import re
+import json
+import time
+import heapq
+import logging
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_active_profiles = contextvars.ContextVar("sql_profiles", default=())
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def debug_mode() -> bool:
+    return _env_bool("DEBUG_MODE", False)
+
+
+def strict_mode() -> bool:
+    return _env_bool("SQL_PROFILE_STRICT", False)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a block runs more statements than its budget"""
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals, parameters and IN lists become '?'"""
+    shape = _LITERAL_RE.sub("?", statement)
+    shape = _PARAM_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+class SQLProfile:
+    """Statement count, DB time, slowest statements and repeated shapes for one block"""
+
+    def __init__(self, name: str, budget: int = None):
+        self.name = name
+        self.budget = budget
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self._slowest = []
+        self._slow_limit = int(os.getenv("SQL_PROFILE_SLOWEST", 5))
+        self._n_plus_one_threshold = int(os.getenv("SQL_NPLUSONE_THRESHOLD", 5))
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.shapes[normalize_statement(statement)] += 1
+        item = (duration, self.count, statement)
+        if len(self._slowest) < self._slow_limit:
+            heapq.heappush(self._slowest, item)
+        else:
+            heapq.heappushpop(self._slowest, item)
+
+    @property
+    def slowest(self) -> list:
+        return [
+            {"ms": round(duration * 1000, 2), "statement": statement[:500]}
+            for duration, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+    @property
+    def n_plus_one(self) -> list:
+        return [
+            {"shape": shape[:500], "count": count}
+            for shape, count in self.shapes.most_common()
+            if count >= self._n_plus_one_threshold
+        ]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def summary(self) -> dict:
+        return {
+            "sql_profile": self.name,
+            "queries": self.count,
+            "db_ms": round(self.total_time * 1000, 2),
+            "budget": self.budget,
+            "slowest": self.slowest,
+            "n_plus_one": self.n_plus_one,
+        }
+
+    def headers(self) -> dict:
+        return {
+            "X-SQL-Queries": str(self.count),
+            "X-SQL-Time-Ms": f"{self.total_time * 1000:.2f}",
+            "X-SQL-N-Plus-One": str(len(self.n_plus_one)),
+        }
+
+
+@contextmanager
+def profile(name: str, budget: int = None, log: bool = True):
+    """Profile every statement executed in this block (and in nested blocks)"""
+    prof = SQLProfile(name, budget)
+    token = _active_profiles.set(_active_profiles.get() + (prof,))
+    try:
+        yield prof
+    finally:
+        _active_profiles.reset(token)
+    if log:
+        logger.info(json.dumps(prof.summary()))
+    if prof.over_budget:
+        message = f"{name} ran {prof.count} queries, budget is {budget}"
+        if strict_mode():
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    profiles = _active_profiles.get()
+    if profiles:
+        duration = time.perf_counter() - started
+        for prof in profiles:
+            prof.record(statement, duration)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument(engine):
+    """Attach the profiling listeners to a (sync) engine"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
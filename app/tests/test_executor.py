@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from multi_agents.executor import CrewExecutor, CrewQueueFull
+
+
+def _blocked_executor():
+    """An executor whose only worker is held until the returned event is set"""
+    executor = CrewExecutor(max_workers=1, max_queue=2)
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    running = executor.submit(hold)
+    assert started.wait(5)
+    return executor, running, release
+
+
+def test_cancelled_queued_runs_release_their_slots():
+    executor, running, release = _blocked_executor()
+    queued = [executor.submit(lambda: None) for _ in range(2)]
+    assert executor.stats()["queue_depth"] == 2
+
+    for future in queued:
+        assert future.cancel()
+    stats = executor.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["cancelled"] == 2
+
+    # The freed slots take new work instead of answering CrewQueueFull
+    replacements = [executor.submit(lambda: "ok") for _ in range(2)]
+    release.set()
+    assert [future.result(5) for future in replacements] == ["ok", "ok"]
+    running.result(5)
+    stats = executor.stats()
+    assert (stats["queue_depth"], stats["running"]) == (0, 0)
+    executor.shutdown()
+
+
+def test_cancelled_await_releases_its_slot():
+    executor, running, release = _blocked_executor()
+
+    async def cancel_waiting_run():
+        task = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0)
+        assert executor.stats()["queue_depth"] == 1
+        task.cancel()
+        await asyncio.sleep(0)
+
+    asyncio.run(cancel_waiting_run())
+    assert executor.stats()["queue_depth"] == 0
+    release.set()
+    running.result(5)
+    executor.shutdown()
+
+
+def test_full_queue_is_rejected():
+    executor, running, release = _blocked_executor()
+    for _ in range(2):
+        executor.submit(lambda: None)
+    try:
+        executor.submit(lambda: None)
+    except CrewQueueFull:
+        pass
+    else:
+        raise AssertionError("expected CrewQueueFull")
+    release.set()
+    running.result(5)
+    executor.shutdown()
@@ -0,0 +1,174 @@
+"""
+Rolling-window trending scores.
+
+Views and registrations are counted per event in fixed-width time buckets
+(``event_activity_buckets``). A background job periodically folds the buckets
+inside the sliding window into ``events.trending_score``:
+
+    score = Σ (views · TRENDING_VIEW_WEIGHT + registrations · TRENDING_REGISTRATION_WEIGHT)
+            · 0.5 ^ (bucket age / TRENDING_HALF_LIFE_HOURS)
+
+so recent activity dominates and lifetime totals fade out. It also drops
+buckets that have left the window. Trending reads order by the indexed
+score column and never touch the raw counters.
+"""
+import os
+import logging
+import hashlib
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, insert, select, text, update
+import cache
+from models import Event, event_activity_buckets
+
+logger = logging.getLogger(__name__)
+
+# Only one process refreshes at a time on Postgres
+_LOCK_KEY = int(hashlib.sha1(b"clubevent-hub-trending").hexdigest()[:15], 16)
+
+# Scores below this are stored as 0 so the index only orders events that are actually active
+MIN_SCORE = 0.01
+
+
+def _setting(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def bucket_start(moment: datetime) -> datetime:
+    """Start of the TRENDING_BUCKET_MINUTES bucket containing ``moment``"""
+    width = int(_setting("TRENDING_BUCKET_MINUTES", 60)) * 60
+    seconds = int((moment - datetime.min).total_seconds())
+    return datetime.min + timedelta(seconds=seconds - seconds % width)
+
+
+def activity_upsert(dialect_name: str, rows: list):
+    """
+    Statement adding ``rows`` ({event_id, bucket_start, views, registrations})
+    to the buckets, incrementing rows that already exist.
+    """
+    table = event_activity_buckets
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table).values(rows)
+    stmt = dialect_insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.event_id, table.c.bucket_start],
+        set_={
+            "views": table.c.views + stmt.excluded.views,
+            "registrations": table.c.registrations + stmt.excluded.registrations,
+        }
+    )
+
+
+def record_activity(dialect_name: str, event_id: int, views: int = 0, registrations: int = 0, at: datetime = None):
+    """Statement counting one event's activity in its current bucket"""
+    return activity_upsert(dialect_name, [{
+        "event_id": event_id,
+        "bucket_start": bucket_start(at or datetime.utcnow()),
+        "views": views,
+        "registrations": registrations,
+    }])
+
+
+def compute_scores(rows, now: datetime) -> dict:
+    """{event_id: score} from (event_id, bucket_start, views, registrations) rows"""
+    half_life = _setting("TRENDING_HALF_LIFE_HOURS", 12)
+    view_weight = _setting("TRENDING_VIEW_WEIGHT", 1)
+    registration_weight = _setting("TRENDING_REGISTRATION_WEIGHT", 5)
+    scores = defaultdict(float)
+    for event_id, started, views, registrations in rows:
+        age_hours = max(0.0, (now - started).total_seconds() / 3600)
+        activity = views * view_weight + registrations * registration_weight
+        scores[event_id] += activity * 0.5 ** (age_hours / half_life)
+    return {event_id: round(score, 4) for event_id, score in scores.items() if score >= MIN_SCORE}
+
+
+def refresh(engine, now: datetime = None) -> int:
+    """Recompute every trending score from the window; returns the number of active events"""
+    now = now or datetime.utcnow()
+    window_start = now - timedelta(hours=_setting("TRENDING_WINDOW_HOURS", 72))
+    buckets = event_activity_buckets
+    events = Event.__table__
+
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            locked = conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}).scalar()
+            if not locked:
+                return 0
+        scores = compute_scores(conn.execute(
+            select(buckets.c.event_id, buckets.c.bucket_start, buckets.c.views, buckets.c.registrations)
+            .where(buckets.c.bucket_start >= window_start)
+        ), now)
+
+        # updated_at is set to itself so its onupdate default doesn't fire for a score change
+        if scores:
+            conn.execute(
+                update(events).where(events.c.id == bindparam("event_id"))
+                .values(trending_score=bindparam("score"), updated_at=events.c.updated_at),
+                [{"event_id": event_id, "score": score} for event_id, score in sorted(scores.items())]
+            )
+        # Only events that fell out of the window are reset, not every scored row
+        conn.execute(
+            update(events).where(events.c.trending_score > 0, events.c.id.not_in(list(scores)))
+            .values(trending_score=0, updated_at=events.c.updated_at)
+        )
+        conn.execute(buckets.delete().where(buckets.c.bucket_start < window_start))
+
+    cache.invalidate(("trending",))
+    return len(scores)
+
+
+class TrendingRefresher:
+    """Daemon thread running refresh() every ``interval`` seconds"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _loop(self):
+        from database import get_engine
+
+        while True:
+            try:
+                active = refresh(get_engine())
+                logger.debug(f"Trending scores refreshed: {active} active events")
+            except Exception:
+                logger.exception("Trending refresh failed")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="trending-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_refresher = None
+
+
+def start():
+    """Start the background refresh; TRENDING_REFRESH_SECONDS=0 disables it"""
+    global _refresher
+    interval = _setting("TRENDING_REFRESH_SECONDS", 60)
+    if interval <= 0 or _refresher is not None:
+        return
+    _refresher = TrendingRefresher(interval)
+    _refresher.start()
+
+
+def stop():
+    global _refresher
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
@@ -0,0 +1,171 @@
+"""
+Write-coalesced event view counter.
+
+GET /events/{id} only records the view in memory. A daemon thread flushes
+the pending counts every VIEW_FLUSH_SECONDS, or as soon as
+VIEW_FLUSH_THRESHOLD views are pending. A flush is one transaction: a
+batched ``view_count = view_count + n`` UPDATE per touched event, in id order
+so concurrent workers never deadlock, plus the matching activity-bucket rows
+for trending. Views of events deleted since they were recorded are dropped.
+A failed flush puts its counts back for the next attempt, up to
+VIEW_FLUSH_MAX_ATTEMPTS, and stop() flushes whatever is left, so view_count
+is eventually consistent. Each worker process keeps its own buffer.
+"""
+import os
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import bindparam, select, update
+from models import Event
+from .trending import activity_upsert, bucket_start
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    def __init__(self, interval: float, threshold: int, max_attempts: int = 5):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_attempts = max_attempts
+        self._pending = Counter()  # (event_id, bucket_start) -> views
+        self._pending_total = 0  # sum of _pending, kept so record() stays O(1)
+        self._failures = Counter()  # (event_id, bucket_start) -> failed flushes so far
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = Counter()
+
+    def record(self, event_id: int, views: int = 1):
+        with self._lock:
+            self._pending[(event_id, bucket_start(datetime.utcnow()))] += views
+            self._pending_total += views
+            pending = self._pending_total
+        if pending >= self.threshold:
+            self._wake.set()
+
+    def flush(self, engine=None) -> int:
+        """Write every pending view; returns how many were written"""
+        from database import get_engine
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+                self._pending_total = 0
+            if not batch:
+                return 0
+
+            events = Event.__table__
+            engine = engine or get_engine()
+            try:
+                with engine.begin() as conn:
+                    # Locked so the events can't be deleted before their bucket rows are written
+                    existing = set(conn.execute(
+                        select(events.c.id)
+                        .where(events.c.id.in_({event_id for event_id, _ in batch}))
+                        .with_for_update()
+                    ).scalars())
+                    live = {key: views for key, views in batch.items() if key[0] in existing}
+                    per_event = Counter()
+                    for (event_id, _), views in live.items():
+                        per_event[event_id] += views
+                    if live:
+                        # updated_at is set to itself so its onupdate default doesn't fire for a view
+                        conn.execute(
+                            update(events).where(events.c.id == bindparam("event_id"))
+                            .values(view_count=events.c.view_count + bindparam("views"), updated_at=events.c.updated_at),
+                            [{"event_id": event_id, "views": views} for event_id, views in sorted(per_event.items())]
+                        )
+                        conn.execute(activity_upsert(conn.dialect.name, [
+                            {"event_id": event_id, "bucket_start": started, "views": views, "registrations": 0}
+                            for (event_id, started), views in sorted(live.items())
+                        ]))
+            except Exception:
+                logger.exception("View counter flush failed")
+                self._retry(batch)
+                return 0
+
+            with self._lock:
+                for key in batch:
+                    self._failures.pop(key, None)
+            written = sum(live.values())
+            self._stats["flushes"] += 1
+            self._stats["views_written"] += written
+            self._stats["views_dropped"] += sum(batch.values()) - written
+            return written
+
+    def _retry(self, batch: Counter):
+        """Put a failed batch back, dropping views that have failed max_attempts flushes"""
+        kept = dropped = 0
+        with self._lock:
+            for key, views in batch.items():
+                self._failures[key] += 1
+                if self._failures[key] >= self.max_attempts:
+                    del self._failures[key]
+                    dropped += views
+                else:
+                    self._pending[key] += views
+                    kept += views
+            self._pending_total += kept
+        self._stats["failed_flushes"] += 1
+        self._stats["views_dropped"] += dropped
+        if dropped:
+            logger.error(f"Dropped {dropped} views after {self.max_attempts} failed flushes")
+        logger.warning(f"{kept} views kept for the next flush")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="view-counter", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        return {"pending_views": self._pending_total, "interval": self.interval, "threshold": self.threshold, **self._stats}
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_counter() -> ViewCounter:
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = ViewCounter(
+                    interval=float(os.getenv("VIEW_FLUSH_SECONDS", 5)),
+                    threshold=int(os.getenv("VIEW_FLUSH_THRESHOLD", 1000)),
+                    max_attempts=int(os.getenv("VIEW_FLUSH_MAX_ATTEMPTS", 5)),
+                )
+    return _counter
+
+
+def record_view(event_id: int):
+    get_counter().record(event_id)
+
+
+def start():
+    get_counter().start()
+
+
+def stop():
+    """Stop the flush thread and write the remaining views"""
+    global _counter
+    if _counter is not None:
+        _counter.stop()
+        _counter = None